@@ -1,8 +1,13 @@
 """SQLite database layer for HireUp. Uses a single file (hireup.db) for persistence."""
 from __future__ import annotations
 
+import queue
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from uuid import uuid4
 
 import bcrypt
@@ -13,12 +18,60 @@ except ImportError:
     from config import DB_PATH
 
 
-def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+
+# Idle connections, most recently used first so hot page caches get reused.
+_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=POOL_MAX_SIZE)
+
+
+def _connect() -> sqlite3.Connection:
+    # Autocommit mode: multi-statement writes open their own transaction with BEGIN IMMEDIATE.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=512)
     conn.row_factory = sqlite3.Row
+    # WAL lets readers run alongside a writer; NORMAL sync only fsyncs at checkpoints.
+    conn.executescript(
+        """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        """
+    )
     return conn
 
 
+def _release(conn: sqlite3.Connection) -> None:
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection; commits (or rolls back) on exit and returns it to the pool."""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        _release(conn)
+
+
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    """Run a SELECT with plain tuple rows and zip them against the column names once."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
 def _ensure_company_profile_columns(conn: sqlite3.Connection) -> None:
     for stmt in (
         "ALTER TABLE companies ADD COLUMN stage TEXT",
@@ -30,7 +83,14 @@ def _ensure_company_profile_columns(conn: sqlite3.Connection) -> None:
             pass
 
 
+# Set once init_db() has run in this process, so repeat calls (app startup plus seed scripts) skip the DDL.
+_db_initialized = False
+
+
 def init_db() -> None:
+    global _db_initialized
+    if _db_initialized:
+        return
     with get_conn() as conn:
         conn.executescript(
             """
@@ -135,6 +195,51 @@ def init_db() -> None:
             );
             CREATE INDEX IF NOT EXISTS idx_report_scores_report ON report_scores(report_id);
             CREATE INDEX IF NOT EXISTS idx_report_scores_application ON report_scores(application_id);
+
+            CREATE TABLE IF NOT EXISTS resume_text_cache (
+                hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                created_at TEXT DEFAULT (datetime('now'))
+            );
+
+            CREATE TABLE IF NOT EXISTS openai_cache (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS gpt_score_cache (
+                key TEXT PRIMARY KEY,
+                response_json TEXT NOT NULL,
+                created_at TEXT DEFAULT (datetime('now'))
+            );
+
+            CREATE TABLE IF NOT EXISTS company_activities (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company_id TEXT NOT NULL,
+                action TEXT NOT NULL,
+                detail TEXT NOT NULL,
+                time TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_company_activities_company ON company_activities(company_id, id);
+
+            CREATE TABLE IF NOT EXISTS openai_batches (
+                id TEXT PRIMARY KEY,
+                company_id TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'submitted',
+                created_at TEXT DEFAULT (datetime('now')),
+                completed_at TEXT,
+                FOREIGN KEY (company_id) REFERENCES companies(id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_openai_batches_status ON openai_batches(status);
+
+            CREATE TABLE IF NOT EXISTS openai_batch_items (
+                batch_id TEXT NOT NULL,
+                application_id TEXT NOT NULL,
+                PRIMARY KEY (batch_id, application_id),
+                FOREIGN KEY (batch_id) REFERENCES openai_batches(id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_openai_batch_items_application ON openai_batch_items(application_id);
             """
         )
 
@@ -176,6 +281,22 @@ def init_db() -> None:
             pass
         conn.execute("UPDATE agent_messages SET chat_id = 'legacy' WHERE chat_id IS NULL OR chat_id = ''")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_messages_company_chat ON agent_messages(company_id, chat_id)")
+        conn.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_agent_messages_company_created ON agent_messages(company_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_custom_reports_company_created
+                ON custom_reports(company_id, created_at DESC, job_id);
+            CREATE INDEX IF NOT EXISTS idx_report_scores_report_score ON report_scores(report_id, custom_fit_score DESC);
+            CREATE INDEX IF NOT EXISTS idx_jobs_company_created ON jobs(company_id, created_at DESC);
+            """
+        )
+        # One application per (user, job); lets seeds use INSERT OR IGNORE. Skipped if old duplicates exist.
+        try:
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_user_job_unique ON applications(user_id, job_id)"
+            )
+        except sqlite3.IntegrityError:
+            pass
         
         # Add report metadata column for agent messages
         try:
@@ -183,6 +304,14 @@ def init_db() -> None:
         except sqlite3.OperationalError:
             pass
 
+        # Refresh planner statistics (only re-analyzes tables that need it) so the indexes above get used.
+        conn.execute("PRAGMA optimize")
+
+    # Warm the pool so the first requests don't pay for opening the database file.
+    while _pool.qsize() < POOL_MIN_SIZE:
+        _release(_connect())
+    _db_initialized = True
+
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -258,53 +387,118 @@ def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
         row = conn.execute(
             """
-            SELECT id, email, password_hash, name, objective, resume, resume_pdf, resume_text, interests, career_objective,
-                   grad_date, linkedin_url, github_url
+            SELECT id, email, password_hash, COALESCE(name, '') AS name, COALESCE(objective, '') AS objective,
+                   COALESCE(resume, '') AS resume, resume_pdf, COALESCE(resume_text, '') AS resume_text,
+                   COALESCE(interests, '[]') AS interests, COALESCE(career_objective, '') AS career_objective,
+                   COALESCE(grad_date, '') AS grad_date, COALESCE(linkedin_url, '') AS linkedin_url,
+                   COALESCE(github_url, '') AS github_url, 'user' AS account_type
             FROM users WHERE email = ?
             """,
             (email,),
         ).fetchone()
+    return dict(row) if row else None
+
+
+def _get_user_password_hash(email: str) -> Optional[tuple[str, str]]:
+    with get_conn() as conn:
+        row = conn.execute("SELECT id, password_hash FROM users WHERE email = ?", (email,)).fetchone()
     if not row:
         return None
-
-    return {
-        "id": row["id"],
-        "email": row["email"],
-        "password_hash": row["password_hash"],
-        "name": row["name"] or "",
-        "objective": row["objective"] or "",
-        "resume": row["resume"] or "",
-        "resume_pdf": row["resume_pdf"],
-        "resume_text": row["resume_text"] or "",
-        "interests": row["interests"] or "[]",
-        "career_objective": row["career_objective"] or "",
-        "grad_date": row["grad_date"] or "",
-        "linkedin_url": row["linkedin_url"] or "",
-        "github_url": row["github_url"] or "",
-        "account_type": "user",
-    }
+    return row["id"], row["password_hash"]
 
 
 def verify_user(email: str, password: str) -> Optional[Dict[str, Any]]:
-    user = get_user_by_email(email)
-    if not user or not verify_password(password, user["password_hash"]):
+    # Only the hash is read up front; the profile (resume blob included) is loaded after bcrypt passes.
+    credentials = _get_user_password_hash(email)
+    if not credentials or not verify_password(password, credentials[1]):
+        return None
+    user = get_user_by_id(credentials[0])
+    if not user:
         return None
-    return {k: v for k, v in user.items() if k != "password_hash"}
+    return {**user, "account_type": "user"}
+
+
+_SQL_GET_USER_BY_ID = """
+    SELECT id, email, name, objective, resume, resume_pdf, resume_text, interests, career_objective,
+           grad_date, linkedin_url, github_url
+    FROM users WHERE id = ?
+"""
 
 
 def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
-        row = conn.execute(
-            """
-            SELECT id, email, name, objective, resume, resume_pdf, resume_text, interests, career_objective,
+        row = conn.execute(_SQL_GET_USER_BY_ID, (user_id,)).fetchone()
+    if not row:
+        return None
+    return dict(row)
+
+
+def get_users_by_ids(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Profiles (without the resume PDF) for several users in one query, keyed by id."""
+    if not user_ids:
+        return {}
+    placeholders = ",".join(["?"] * len(user_ids))
+    with get_conn() as conn:
+        rows = _fetch_dicts(
+            conn,
+            f"""
+            SELECT id, email, name, objective, resume, resume_text, interests, career_objective,
                    grad_date, linkedin_url, github_url
-            FROM users WHERE id = ?
+            FROM users WHERE id IN ({placeholders})
             """,
+            tuple(user_ids),
+        )
+    return {row["id"]: row for row in rows}
+
+
+USER_EXISTS_TTL_SECONDS = 30.0
+_USER_EXISTS_CACHE_SIZE = 1024
+
+# user_id -> expiry (monotonic). Only hits are cached; users are never deleted, so a hit cannot go stale.
+_user_exists_cache: OrderedDict[str, float] = OrderedDict()
+_user_exists_lock = threading.Lock()
+
+
+def user_exists(user_id: str) -> bool:
+    """Cheap presence check for user routes, backed by a small TTL LRU."""
+    now = time.monotonic()
+    with _user_exists_lock:
+        expires = _user_exists_cache.get(user_id)
+        if expires is not None and expires > now:
+            _user_exists_cache.move_to_end(user_id)
+            return True
+    with get_conn() as conn:
+        row = conn.execute("SELECT 1 FROM users WHERE id = ?", (user_id,)).fetchone()
+    if not row:
+        return False
+    with _user_exists_lock:
+        _user_exists_cache[user_id] = now + USER_EXISTS_TTL_SECONDS
+        _user_exists_cache.move_to_end(user_id)
+        if len(_user_exists_cache) > _USER_EXISTS_CACHE_SIZE:
+            _user_exists_cache.popitem(last=False)
+    return True
+
+
+def stream_resume_pdf(user_id: str, chunk_size: int = 65536) -> Iterator[Any]:
+    """Generator that first yields (name, size) for a user's resume PDF, or None if the user doesn't exist,
+    then the PDF itself in chunks. Size and bytes come from one blob handle inside one read transaction,
+    so a concurrent re-upload can't make the declared length disagree with what is streamed."""
+    with get_conn() as conn:
+        conn.execute("BEGIN")
+        row = conn.execute(
+            "SELECT rowid, name, resume_pdf IS NOT NULL AS has_pdf FROM users WHERE id = ?",
             (user_id,),
         ).fetchone()
-    if not row:
-        return None
-    return dict(row)
+        if not row:
+            yield None
+            return
+        if not row["has_pdf"]:
+            yield (row["name"], 0)
+            return
+        with conn.blobopen("users", "resume_pdf", row["rowid"], readonly=True) as blob:
+            yield (row["name"], len(blob))
+            while chunk := blob.read(chunk_size):
+                yield chunk
 
 
 def update_user(
@@ -320,9 +514,7 @@ def update_user(
     linkedin_url: str | None = None,
     github_url: str | None = None,
 ) -> bool:
-    if not get_user_by_id(user_id):
-        return False
-
+    """Update the given fields. Returns False if the user doesn't exist."""
     updates = []
     params = []
     if name is not None:
@@ -357,12 +549,13 @@ def update_user(
         params.append(github_url)
 
     if not updates:
-        return True
+        return user_exists(user_id)
 
     params.append(user_id)
+    # rowcount doubles as the existence check, so the row (and its resume blob) is never read back.
     with get_conn() as conn:
-        conn.execute(f"UPDATE users SET {', '.join(updates)} WHERE id = ?", params)
-    return True
+        cur = conn.execute(f"UPDATE users SET {', '.join(updates)} WHERE id = ?", params)
+    return cur.rowcount > 0
 
 
 def update_user_profile(
@@ -391,6 +584,134 @@ def update_user_profile(
     return get_user_by_id(user_id)
 
 
+def get_cached_resume_text(content_hash: str) -> Optional[str]:
+    with get_conn() as conn:
+        row = conn.execute("SELECT text FROM resume_text_cache WHERE hash = ?", (content_hash,)).fetchone()
+    return row["text"] if row else None
+
+
+def put_cached_resume_text(content_hash: str, text: str) -> None:
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO resume_text_cache (hash, text) VALUES (?, ?)",
+            (content_hash, text),
+        )
+
+
+def get_cached_openai_response(key: str, max_age_seconds: float) -> Optional[tuple[bytes, float]]:
+    """(body, created_at) for a cached OpenAI response younger than max_age_seconds."""
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT body, created_at FROM openai_cache WHERE key = ? AND created_at > ?",
+            (key, time.time() - max_age_seconds),
+        ).fetchone()
+    return (row["body"], row["created_at"]) if row else None
+
+
+def put_cached_openai_response(key: str, body: bytes) -> float:
+    created_at = time.time()
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO openai_cache (key, body, created_at) VALUES (?, ?, ?)",
+            (key, body, created_at),
+        )
+    return created_at
+
+
+def get_gpt_score_cache(keys: List[str]) -> Dict[str, str]:
+    """response_json for each cached key (missing keys are omitted)."""
+    if not keys:
+        return {}
+    placeholders = ",".join("?" for _ in keys)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT key, response_json FROM gpt_score_cache WHERE key IN ({placeholders})",
+            tuple(keys),
+        ).fetchall()
+    return {row["key"]: row["response_json"] for row in rows}
+
+
+def put_gpt_score_cache(items: List[tuple[str, str]]) -> None:
+    """Store (key, response_json) pairs."""
+    if not items:
+        return
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("INSERT OR REPLACE INTO gpt_score_cache (key, response_json) VALUES (?, ?)", items)
+
+
+def create_openai_batch(batch_id: str, company_id: str, application_ids: List[str]) -> None:
+    """Record a submitted OpenAI Batch API job and the applications in it, so poll_openai_batches
+    can collect its results and nothing re-submits those applications while it is pending."""
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO openai_batches (id, company_id) VALUES (?, ?)", (batch_id, company_id))
+        conn.executemany(
+            "INSERT OR IGNORE INTO openai_batch_items (batch_id, application_id) VALUES (?, ?)",
+            [(batch_id, application_id) for application_id in application_ids],
+        )
+
+
+def get_pending_batch_application_ids(company_id: str) -> set[str]:
+    """Ids of the company's applications that are in a batch still waiting on OpenAI."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT i.application_id
+            FROM openai_batch_items i
+            INNER JOIN openai_batches b ON b.id = i.batch_id
+            WHERE b.company_id = ? AND b.status = 'submitted'
+            """,
+            (company_id,),
+        ).fetchall()
+    return {row[0] for row in rows}
+
+
+def get_pending_openai_batches() -> List[Dict[str, Any]]:
+    with get_conn() as conn:
+        return _fetch_dicts(
+            conn,
+            "SELECT id, company_id, created_at FROM openai_batches WHERE status = 'submitted' ORDER BY created_at",
+        )
+
+
+def update_openai_batch_status(batch_id: str, status: str) -> None:
+    with get_conn() as conn:
+        conn.execute(
+            "UPDATE openai_batches SET status = ?, completed_at = datetime('now') WHERE id = ?",
+            (status, batch_id),
+        )
+
+
+def save_company_activities_bulk(rows: List[tuple]) -> None:
+    """Append many activity feed entries in one transaction. Each row is (company_id, action, detail, time)."""
+    if not rows:
+        return
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "INSERT INTO company_activities (company_id, action, detail, time) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+
+def get_recent_company_activities(company_id: str, limit: int) -> List[Dict[str, Any]]:
+    """The company's latest `limit` activity entries, oldest first."""
+    with get_conn() as conn:
+        rows = _fetch_dicts(
+            conn,
+            """
+            SELECT action, detail, time FROM company_activities
+            WHERE company_id = ?
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (company_id, limit),
+        )
+    rows.reverse()
+    return rows
+
+
 # --- Companies ---
 def create_company(
     email: str,
@@ -446,33 +767,33 @@ def get_company_by_email(email: str) -> Optional[Dict[str, Any]]:
         _ensure_company_profile_columns(conn)
         row = conn.execute(
             """
-            SELECT id, email, password_hash, company_name, website, description, company_size, stage, culture_benefits
+            SELECT id, email, password_hash, COALESCE(company_name, '') AS company_name,
+                   COALESCE(website, '') AS website, COALESCE(description, '') AS description,
+                   COALESCE(company_size, '') AS company_size, COALESCE(stage, '') AS stage,
+                   COALESCE(culture_benefits, '') AS culture_benefits, 'company' AS account_type
             FROM companies WHERE email = ?
             """,
             (email,),
         ).fetchone()
+    return dict(row) if row else None
+
+
+def _get_company_password_hash(email: str) -> Optional[tuple[str, str]]:
+    with get_conn() as conn:
+        row = conn.execute("SELECT id, password_hash FROM companies WHERE email = ?", (email,)).fetchone()
     if not row:
         return None
-
-    return {
-        "id": row["id"],
-        "email": row["email"],
-        "password_hash": row["password_hash"],
-        "company_name": row["company_name"] or "",
-        "website": row["website"] or "",
-        "description": row["description"] or "",
-        "company_size": row["company_size"] or "",
-        "stage": row["stage"] or "",
-        "culture_benefits": row["culture_benefits"] or "",
-        "account_type": "company",
-    }
+    return row["id"], row["password_hash"]
 
 
 def verify_company(email: str, password: str) -> Optional[Dict[str, Any]]:
-    company = get_company_by_email(email)
-    if not company or not verify_password(password, company["password_hash"]):
+    credentials = _get_company_password_hash(email)
+    if not credentials or not verify_password(password, credentials[1]):
+        return None
+    company = get_company_by_id(credentials[0])
+    if not company:
         return None
-    return {k: v for k, v in company.items() if k != "password_hash"}
+    return {**company, "account_type": "company"}
 
 
 def get_company_by_id(company_id: str) -> Optional[Dict[str, Any]]:
@@ -490,6 +811,22 @@ def get_company_by_id(company_id: str) -> Optional[Dict[str, Any]]:
     return dict(row)
 
 
+# company_name -> id. Only hits are cached; cleared whenever a company profile (and so its name) changes.
+_company_id_by_name: Dict[str, str] = {}
+
+
+def get_company_id_by_name(company_name: str) -> Optional[str]:
+    """Id of the company with this name, memoized for the life of the process."""
+    company_id = _company_id_by_name.get(company_name)
+    if company_id is None:
+        with get_conn() as conn:
+            row = conn.execute("SELECT id FROM companies WHERE company_name = ?", (company_name,)).fetchone()
+        if not row:
+            return None
+        company_id = _company_id_by_name[company_name] = row["id"]
+    return company_id
+
+
 def update_company_profile(
     company_id: str,
     company_name: str,
@@ -499,20 +836,22 @@ def update_company_profile(
     stage: str,
     culture_benefits: str,
 ) -> Optional[Dict[str, Any]]:
+    """Update the profile and return the updated row (as get_company_by_id would), or None if no such company."""
     with get_conn() as conn:
         _ensure_company_profile_columns(conn)
-        row = conn.execute("SELECT id FROM companies WHERE id = ?", (company_id,)).fetchone()
-        if not row:
-            return None
-        conn.execute(
+        row = conn.execute(
             """
             UPDATE companies
             SET company_name = ?, website = ?, description = ?, company_size = ?, stage = ?, culture_benefits = ?
             WHERE id = ?
+            RETURNING id, email, company_name, website, description, company_size, stage, culture_benefits
             """,
             (company_name, website, description, company_size, stage, culture_benefits, company_id),
-        )
-    return get_company_by_id(company_id)
+        ).fetchone()
+    if not row:
+        return None
+    _company_id_by_name.clear()
+    return dict(row)
 
 
 # --- Sessions ---
@@ -558,6 +897,28 @@ def create_job(
     return job_id
 
 
+def create_job_if_company_exists(
+    company_id: str,
+    title: str,
+    description: str = "",
+    skills: str = "[]",
+    location: str = "Remote",
+    salary_range: str = "TBD",
+) -> Optional[str]:
+    """Like create_job, but checks the company in the same statement. Returns None if it doesn't exist."""
+    job_id = str(uuid4())
+    with get_conn() as conn:
+        cur = conn.execute(
+            """
+            INSERT INTO jobs (id, company_id, title, description, skills, location, salary_range)
+            SELECT ?, ?, ?, ?, ?, ?, ?
+            WHERE EXISTS (SELECT 1 FROM companies WHERE id = ?)
+            """,
+            (job_id, company_id, title, description, skills, location, salary_range, company_id),
+        )
+    return job_id if cur.rowcount else None
+
+
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
         row = conn.execute(
@@ -572,6 +933,23 @@ def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     return dict(row)
 
 
+def get_jobs_by_ids(job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Several jobs in one query, keyed by id (missing ids are omitted)."""
+    if not job_ids:
+        return {}
+    placeholders = ",".join(["?"] * len(job_ids))
+    with get_conn() as conn:
+        rows = _fetch_dicts(
+            conn,
+            f"""
+            SELECT id, company_id, title, description, skills, location, salary_range, status, created_at
+            FROM jobs WHERE id IN ({placeholders})
+            """,
+            tuple(job_ids),
+        )
+    return {row["id"]: row for row in rows}
+
+
 def get_all_jobs(status: str = "open") -> List[Dict[str, Any]]:
     with get_conn() as conn:
         rows = conn.execute(
@@ -589,10 +967,13 @@ def get_all_jobs(status: str = "open") -> List[Dict[str, Any]]:
 
 
 def get_jobs_by_company(company_id: str) -> List[Dict[str, Any]]:
+    """Jobs newest first; `skills` is always valid, minified JSON text ('[]' when unset or malformed)."""
     with get_conn() as conn:
         rows = conn.execute(
             """
-            SELECT id, company_id, title, description, skills, location, salary_range, status, created_at
+            SELECT id, company_id, title, description,
+                   CASE WHEN json_valid(skills) THEN json(skills) ELSE '[]' END AS skills,
+                   location, salary_range, status, created_at
             FROM jobs WHERE company_id = ?
             ORDER BY created_at DESC
             """,
@@ -638,29 +1019,23 @@ def update_job_for_company(
 
 def close_job_for_company(company_id: str, job_id: str) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
-        row = conn.execute(
-            "SELECT id FROM jobs WHERE id = ? AND company_id = ?",
+        conn.execute("BEGIN IMMEDIATE")
+        # RETURNING doubles as the ownership check: no row means the job is not this company's.
+        updated = conn.execute(
+            """
+            UPDATE jobs SET status = 'closed'
+            WHERE id = ? AND company_id = ?
+            RETURNING id, company_id, title, description, skills, location, salary_range, status, created_at
+            """,
             (job_id, company_id),
-        ).fetchone()
-        if not row:
+        ).fetchall()
+        if not updated:
             return None
-        conn.execute(
-            "UPDATE jobs SET status = 'closed' WHERE id = ? AND company_id = ?",
-            (job_id, company_id),
-        )
         conn.execute(
             "UPDATE applications SET status = 'closed' WHERE job_id = ?",
             (job_id,),
         )
-        updated = conn.execute(
-            """
-            SELECT id, company_id, title, description, skills, location, salary_range, status, created_at
-            FROM jobs
-            WHERE id = ? AND company_id = ?
-            """,
-            (job_id, company_id),
-        ).fetchone()
-    return dict(updated) if updated else None
+    return dict(updated[0])
 
 
 # --- Applications ---
@@ -700,6 +1075,29 @@ def get_user_applications(user_id: str) -> List[Dict[str, Any]]:
     return [dict(row) for row in rows]
 
 
+def get_user_applications_checked(user_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Like get_user_applications, but returns None when the user doesn't exist (one query for both)."""
+    with get_conn() as conn:
+        rows = _fetch_dicts(
+            conn,
+            """
+            SELECT a.id, a.user_id, a.job_id, a.status, a.technical_score, a.created_at,
+                   j.title, j.location, j.salary_range, j.status AS job_status, c.company_name
+            FROM users u
+            LEFT JOIN applications a ON a.user_id = u.id
+            LEFT JOIN jobs j ON a.job_id = j.id
+            LEFT JOIN companies c ON j.company_id = c.id
+            WHERE u.id = ?
+            ORDER BY a.created_at DESC
+            """,
+            (user_id,),
+        )
+    if not rows:
+        return None
+    # A user with no applications still yields one all-NULL row from the LEFT JOIN.
+    return [row for row in rows if row["id"] is not None]
+
+
 def check_application_exists(user_id: str, job_id: str) -> bool:
     with get_conn() as conn:
         row = conn.execute(
@@ -747,29 +1145,56 @@ def get_company_applications(company_id: str, job_id: str | None = None) -> List
     return [dict(row) for row in rows]
 
 
-def get_company_application_stats(company_id: str) -> Dict[str, int]:
+def get_all_candidate_skills() -> List[str]:
+    """Raw interests JSON for every user (skill document frequencies for the local ranker)."""
+    with get_conn() as conn:
+        return [row[0] for row in conn.execute("SELECT interests FROM users WHERE interests IS NOT NULL")]
+
+
+def get_candidate_pool(job_id: str) -> List[tuple]:
+    """Just the fields the rankers read, newest application first.
+
+    Rows are (user_id, user_name, interests, resume_text, grad_date, linkedin_url, github_url).
+    """
+    with get_conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT a.user_id, u.name, u.interests, u.resume_text, u.grad_date, u.linkedin_url, u.github_url
+            FROM applications a
+            INNER JOIN users u ON a.user_id = u.id
+            WHERE a.job_id = ?
+            ORDER BY a.created_at DESC
+            """,
+            (job_id,),
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def get_company_dashboard_stats(company_id: str) -> Optional[Dict[str, int]]:
+    """Job count, application total and per-status application counts for a company in one query.
+    Returns None if the company doesn't exist."""
     with get_conn() as conn:
         row = conn.execute(
             """
             SELECT
+                COUNT(DISTINCT j.id) AS job_count,
+                COUNT(a.id) AS total,
                 SUM(CASE WHEN a.status = 'submitted' THEN 1 ELSE 0 END) AS submitted,
                 SUM(CASE WHEN a.status = 'rejected_pre_interview' THEN 1 ELSE 0 END) AS rejected_pre_interview,
                 SUM(CASE WHEN a.status = 'in_progress' THEN 1 ELSE 0 END) AS in_progress,
                 SUM(CASE WHEN a.status = 'rejected_post_interview' THEN 1 ELSE 0 END) AS rejected_post_interview,
                 SUM(CASE WHEN a.status = 'offer' THEN 1 ELSE 0 END) AS offer
-            FROM applications a
-            INNER JOIN jobs j ON a.job_id = j.id
-            WHERE j.company_id = ?
+            FROM companies c
+            LEFT JOIN jobs j ON j.company_id = c.id
+            LEFT JOIN applications a ON a.job_id = j.id
+            WHERE c.id = ?
+            GROUP BY c.id
             """,
             (company_id,),
         ).fetchone()
-    return {
-        "submitted": int((row["submitted"] or 0) if row else 0),
-        "rejected_pre_interview": int((row["rejected_pre_interview"] or 0) if row else 0),
-        "in_progress": int((row["in_progress"] or 0) if row else 0),
-        "rejected_post_interview": int((row["rejected_post_interview"] or 0) if row else 0),
-        "offer": int((row["offer"] or 0) if row else 0),
-    }
+    if not row:
+        return None
+    return {key: int(row[key] or 0) for key in row.keys()}
 
 
 def update_company_application_status(
@@ -828,6 +1253,13 @@ def update_company_application_status(
     return dict(updated) if updated else None
 
 
+_SQL_UPDATE_APPLICATION_FIT_SCORE = """
+    UPDATE applications
+    SET fit_score = ?, fit_reasoning = ?, fit_scored_at = ?, skill_analysis = ?, skill_analysis_summary = ?
+    WHERE id = ?
+"""
+
+
 def update_application_fit_score(
     application_id: str,
     fit_score: int,
@@ -838,16 +1270,57 @@ def update_application_fit_score(
 ) -> None:
     with get_conn() as conn:
         conn.execute(
-            """
-            UPDATE applications
-            SET fit_score = ?, fit_reasoning = ?, fit_scored_at = ?, skill_analysis = ?, skill_analysis_summary = ?
-            WHERE id = ?
-            """,
+            _SQL_UPDATE_APPLICATION_FIT_SCORE,
             (fit_score, fit_reasoning, fit_scored_at, skill_analysis, skill_analysis_summary, application_id),
         )
 
 
+def update_application_fit_scores_bulk(rows: List[tuple]) -> None:
+    """Update many application fit scores in one transaction.
+
+    Each row is (fit_score, fit_reasoning, fit_scored_at, skill_analysis, skill_analysis_summary, application_id).
+    """
+    if not rows:
+        return
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(_SQL_UPDATE_APPLICATION_FIT_SCORE, rows)
+
+
 # --- Agent Messages ---
+_SQL_SAVE_AGENT_MESSAGE = """
+    INSERT OR REPLACE INTO agent_messages (id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_AGENT_MESSAGES_CHAT = """
+    SELECT id, company_id, chat_id, role, content,
+           CASE WHEN json_valid(candidates) THEN json(candidates) ELSE '[]' END AS candidates,
+           ranking_source, report_metadata, created_at
+    FROM agent_messages
+    WHERE company_id = ? AND chat_id = ?
+    ORDER BY created_at ASC
+"""
+_SQL_GET_AGENT_MESSAGES_ALL = """
+    SELECT id, company_id, chat_id, role, content,
+           CASE WHEN json_valid(candidates) THEN json(candidates) ELSE '[]' END AS candidates,
+           ranking_source, report_metadata, created_at
+    FROM agent_messages
+    WHERE company_id = ?
+    ORDER BY created_at ASC
+"""
+_SQL_GET_AGENT_CHATS = """
+    SELECT
+        chat_id,
+        MAX(created_at) AS updated_at,
+        COUNT(*) AS message_count,
+        MAX(CASE WHEN role = 'user' THEN content ELSE '' END) AS last_user_message
+    FROM agent_messages
+    WHERE company_id = ?
+    GROUP BY chat_id
+    ORDER BY updated_at DESC
+"""
+
+
 def save_agent_message(
     company_id: str,
     chat_id: str,
@@ -860,10 +1333,7 @@ def save_agent_message(
 ) -> Dict[str, Any]:
     with get_conn() as conn:
         conn.execute(
-            """
-            INSERT OR REPLACE INTO agent_messages (id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _SQL_SAVE_AGENT_MESSAGE,
             (message_id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata),
         )
     return {
@@ -878,29 +1348,24 @@ def save_agent_message(
     }
 
 
+def save_agent_messages_bulk(rows: List[tuple]) -> None:
+    """Insert or replace many agent messages in one transaction.
+
+    Each row is (id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata).
+    """
+    if not rows:
+        return
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(_SQL_SAVE_AGENT_MESSAGE, rows)
+
+
 def get_agent_messages(company_id: str, chat_id: str | None = None) -> List[Dict[str, Any]]:
+    """Messages oldest first; `candidates` is always valid, minified JSON text ('[]' when unset or malformed)."""
     with get_conn() as conn:
         if chat_id:
-            rows = conn.execute(
-                """
-                SELECT id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata, created_at
-                FROM agent_messages
-                WHERE company_id = ? AND chat_id = ?
-                ORDER BY created_at ASC
-                """,
-                (company_id, chat_id),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT id, company_id, chat_id, role, content, candidates, ranking_source, report_metadata, created_at
-                FROM agent_messages
-                WHERE company_id = ?
-                ORDER BY created_at ASC
-                """,
-                (company_id,),
-            ).fetchall()
-    return [dict(row) for row in rows]
+            return _fetch_dicts(conn, _SQL_GET_AGENT_MESSAGES_CHAT, (company_id, chat_id))
+        return _fetch_dicts(conn, _SQL_GET_AGENT_MESSAGES_ALL, (company_id,))
 
 
 def clear_agent_messages(company_id: str, chat_id: str | None = None) -> None:
@@ -913,24 +1378,42 @@ def clear_agent_messages(company_id: str, chat_id: str | None = None) -> None:
 
 def get_agent_chats(company_id: str) -> List[Dict[str, Any]]:
     with get_conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT
-                chat_id,
-                MAX(created_at) AS updated_at,
-                COUNT(*) AS message_count,
-                MAX(CASE WHEN role = 'user' THEN content ELSE '' END) AS last_user_message
-            FROM agent_messages
-            WHERE company_id = ?
-            GROUP BY chat_id
-            ORDER BY updated_at DESC
-            """,
-            (company_id,),
-        ).fetchall()
+        rows = conn.execute(_SQL_GET_AGENT_CHATS, (company_id,)).fetchall()
     return [dict(row) for row in rows]
 
 
 # --- Custom Reports ---
+_SQL_CREATE_CUSTOM_REPORT = """
+    INSERT INTO custom_reports (id, company_id, job_id, report_name, custom_prompt)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_GET_CUSTOM_REPORTS_JOB = """
+    SELECT id, company_id, job_id, report_name, custom_prompt, created_at
+    FROM custom_reports
+    WHERE company_id = ? AND (job_id = ? OR job_id IS NULL)
+    ORDER BY created_at DESC
+"""
+_SQL_GET_CUSTOM_REPORTS_ALL = """
+    SELECT id, company_id, job_id, report_name, custom_prompt, created_at
+    FROM custom_reports
+    WHERE company_id = ?
+    ORDER BY created_at DESC
+"""
+_SQL_GET_CUSTOM_REPORT = (
+    "SELECT id, company_id, job_id, report_name, custom_prompt, created_at FROM custom_reports WHERE id = ?"
+)
+_SQL_SAVE_REPORT_SCORE = """
+    INSERT OR REPLACE INTO report_scores (id, report_id, application_id, custom_fit_score, custom_fit_reasoning)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_GET_REPORT_SCORES = """
+    SELECT rs.id, rs.report_id, rs.application_id, rs.custom_fit_score, rs.custom_fit_reasoning, rs.scored_at
+    FROM report_scores rs
+    WHERE rs.report_id = ?
+    ORDER BY rs.custom_fit_score DESC
+"""
+
+
 def create_custom_report(
     company_id: str,
     job_id: str | None,
@@ -940,13 +1423,7 @@ def create_custom_report(
     """Create a new custom scoring report."""
     report_id = str(uuid4())
     with get_conn() as conn:
-        conn.execute(
-            """
-            INSERT INTO custom_reports (id, company_id, job_id, report_name, custom_prompt)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (report_id, company_id, job_id, report_name, custom_prompt),
-        )
+        conn.execute(_SQL_CREATE_CUSTOM_REPORT, (report_id, company_id, job_id, report_name, custom_prompt))
     return report_id
 
 
@@ -954,35 +1431,14 @@ def get_custom_reports(company_id: str, job_id: str | None = None) -> List[Dict[
     """Get all custom reports for a company, optionally filtered by job."""
     with get_conn() as conn:
         if job_id:
-            rows = conn.execute(
-                """
-                SELECT id, company_id, job_id, report_name, custom_prompt, created_at
-                FROM custom_reports
-                WHERE company_id = ? AND (job_id = ? OR job_id IS NULL)
-                ORDER BY created_at DESC
-                """,
-                (company_id, job_id),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT id, company_id, job_id, report_name, custom_prompt, created_at
-                FROM custom_reports
-                WHERE company_id = ?
-                ORDER BY created_at DESC
-                """,
-                (company_id,),
-            ).fetchall()
-    return [dict(row) for row in rows]
+            return _fetch_dicts(conn, _SQL_GET_CUSTOM_REPORTS_JOB, (company_id, job_id))
+        return _fetch_dicts(conn, _SQL_GET_CUSTOM_REPORTS_ALL, (company_id,))
 
 
 def get_custom_report(report_id: str) -> Dict[str, Any] | None:
     """Get a specific custom report by ID."""
     with get_conn() as conn:
-        row = conn.execute(
-            "SELECT id, company_id, job_id, report_name, custom_prompt, created_at FROM custom_reports WHERE id = ?",
-            (report_id,),
-        ).fetchone()
+        row = conn.execute(_SQL_GET_CUSTOM_REPORT, (report_id,)).fetchone()
     return dict(row) if row else None
 
 
@@ -996,24 +1452,27 @@ def save_report_score(
     score_id = str(uuid4())
     with get_conn() as conn:
         conn.execute(
-            """
-            INSERT OR REPLACE INTO report_scores (id, report_id, application_id, custom_fit_score, custom_fit_reasoning)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+            _SQL_SAVE_REPORT_SCORE,
             (score_id, report_id, application_id, custom_fit_score, custom_fit_reasoning),
         )
 
 
+def save_report_scores_bulk(report_id: str, rows: List[tuple]) -> None:
+    """Save many custom fit scores for a report in one transaction.
+
+    Each row is (application_id, custom_fit_score, custom_fit_reasoning).
+    """
+    if not rows:
+        return
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            _SQL_SAVE_REPORT_SCORE,
+            [(str(uuid4()), report_id, application_id, score, reasoning) for application_id, score, reasoning in rows],
+        )
+
+
 def get_report_scores(report_id: str) -> List[Dict[str, Any]]:
     """Get all scores for a specific report."""
     with get_conn() as conn:
-        rows = conn.execute(
-            """
-            SELECT rs.id, rs.report_id, rs.application_id, rs.custom_fit_score, rs.custom_fit_reasoning, rs.scored_at
-            FROM report_scores rs
-            WHERE rs.report_id = ?
-            ORDER BY rs.custom_fit_score DESC
-            """,
-            (report_id,),
-        ).fetchall()
-    return [dict(row) for row in rows]
+        return _fetch_dicts(conn, _SQL_GET_REPORT_SCORES, (report_id,))
@@ -1,19 +1,49 @@
 """
 HireUp API – single FastAPI app.
 Run from backend/: uvicorn main:app --reload --port 8000
+Production: uvicorn main:app --loop uvloop --http httptools --workers 1 --port 8000
+(single worker: interview, analytics and scoring state is kept in process memory)
 """
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 import database
 from config import CORS_ORIGINS, CORS_ORIGIN_REGEX
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from routers import auth_router, users_router, companies_router
+from services import company as company_service
 
 database.init_db()
 
-app = FastAPI(title="HireUp API")
+
+class _GZipExceptPaths:
+    """GZipMiddleware for every request except paths under `skip_prefixes`."""
+
+    def __init__(self, app, skip_prefixes: tuple[str, ...], **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Also registered with atexit; this writes the last activity entries before uvicorn reports shutdown.
+    company_service.flush_activities()
+
+
+app = FastAPI(title="HireUp API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +54,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Applicant lists and agent chat history are large, text-heavy JSON; small responses skip compression.
+# Resume PDFs are streamed with an exact Content-Length that gzip would drop, and barely shrink anyway.
+app.add_middleware(_GZipExceptPaths, skip_prefixes=("/resume/",), minimum_size=1024, compresslevel=5)
+
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(companies_router)
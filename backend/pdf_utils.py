@@ -1,16 +1,96 @@
-"""PDF text extraction using PyMuPDF (fitz). Simple and reliable."""
+"""PDF text extraction. Uses pypdfium2 when installed, otherwise PyMuPDF (fitz)."""
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import fitz  # PyMuPDF
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PyMuPDF is not thread-safe, so long documents are split across worker processes instead.
+PARALLEL_MIN_PAGES = 8
+_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Not fork: the server process has live threads (and their locks) that a forked child would inherit.
+            _executor = ProcessPoolExecutor(
+                max_workers=_MAX_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died so the next long document gets a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> str:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        return "".join(doc[i].get_text() for i in range(start, stop))
+    finally:
+        doc.close()
+
+
+def _extract_pdfium(pdf_bytes: bytes) -> str:
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        texts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "".join(texts)
+    finally:
+        pdf.close()
+
 
 def extract_pdf_text(pdf_bytes: bytes) -> str:
     """Extract all text from a PDF. Returns empty string on error."""
+    if pdfium is not None:
+        try:
+            return _extract_pdfium(pdf_bytes)
+        except Exception:
+            pass  # fall back to fitz, which tolerates more malformed files
     try:
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         try:
-            return "".join(page.get_text() for page in doc)
+            page_count = doc.page_count
+            if page_count < PARALLEL_MIN_PAGES or _MAX_WORKERS < 2:
+                return "".join(page.get_text() for page in doc)
         finally:
             doc.close()
+
+        step = -(-page_count // _MAX_WORKERS)
+        starts = list(range(0, page_count, step))
+        stops = [min(start + step, page_count) for start in starts]
+        executor = _get_executor()
+        try:
+            return "".join(executor.map(_extract_page_range, [pdf_bytes] * len(starts), starts, stops))
+        except BrokenProcessPool:
+            # A worker died (crash or OOM). Replace the pool rather than failing every later
+            # document, and extract this one in-process like short documents.
+            print("⚠️  PDF worker pool broke; restarting it and extracting serially", flush=True)
+            _discard_executor(executor)
+            return _extract_page_range(pdf_bytes, 0, page_count)
     except Exception:
         return ""
@@ -0,0 +1,31 @@
+"""Store fit scores from completed OpenAI Batch API jobs (submitted via /score-applicants?mode=batch).
+
+Run from cron, e.g. every 10 minutes: python poll_openai_batches.py
+Pass --loop to keep polling in the foreground instead.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import database
+from services import company as company_service
+
+POLL_INTERVAL_SECONDS = 600
+
+
+def main() -> None:
+    database.init_db()
+    while True:
+        scored = company_service.poll_openai_batches()
+        # Activity entries are normally written by a background thread; don't leave them queued.
+        company_service.flush_activities()
+        print(f"Stored fit scores for {scored} applicants")
+        if "--loop" not in sys.argv:
+            return
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
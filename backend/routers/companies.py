@@ -1,9 +1,11 @@
 """Company routes."""
-import json as _json
 from typing import List, Optional
 
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from schemas.company import (
     CreateJobPostingRequest,
@@ -40,18 +42,13 @@ def delete_job_posting(payload: DeleteJobPostingRequest):
     return {"status": "ok", "job": job}
 
 
-@router.get("/get-company-jobs")
+@router.get("/get-company-jobs", response_model=None)
 def get_company_jobs(company_id: str):
-    from database import get_jobs_by_company
-    import json
-    jobs = get_jobs_by_company(company_id)
-    # Parse skills JSON for each job
+    jobs = database.get_jobs_by_company(company_id)
+    # skills is validated JSON text from SQLite; embed it without a parse/re-encode round trip.
     for job in jobs:
-        try:
-            job["skills"] = json.loads(job.get("skills", "[]"))
-        except Exception:
-            job["skills"] = []
-    return {"company_id": company_id, "jobs": jobs}
+        job["skills"] = orjson.Fragment(job["skills"])
+    return ORJSONResponse({"company_id": company_id, "jobs": jobs})
 
 
 @router.post("/get-top-candidates")
@@ -83,9 +80,9 @@ def submit_interviewee_feedback(payload: SubmitIntervieweeFeedbackRequest):
     return {"status": "ok", "feedback": feedback_entry}
 
 
-@router.get("/company-profile")
-def get_company_profile(company_id: str):
-    return company_service.get_company_profile(company_id)
+@router.get("/company-profile", response_model=None)
+async def get_company_profile(company_id: str):
+    return ORJSONResponse(await run_in_threadpool(company_service.get_company_profile, company_id))
 
 
 @router.put("/company-profile")
@@ -94,30 +91,37 @@ def update_company_profile(payload: UpdateCompanyProfileRequest):
     return {"status": "ok", "profile": profile}
 
 
-@router.get("/company-dashboard")
-def get_company_dashboard(company_id: str):
-    return company_service.get_company_dashboard(company_id)
+@router.get("/company-dashboard", response_model=None)
+async def get_company_dashboard(company_id: str):
+    return ORJSONResponse(await run_in_threadpool(company_service.get_company_dashboard, company_id))
 
 
-@router.get("/company-job-postings")
-def get_company_job_postings(company_id: str):
-    jobs = company_service.list_company_jobs(company_id)
-    return {"company_id": company_id, "jobs": jobs}
+@router.get("/company-job-postings", response_model=None)
+async def get_company_job_postings(company_id: str):
+    jobs = await run_in_threadpool(company_service.list_company_jobs, company_id)
+    return ORJSONResponse({"company_id": company_id, "jobs": jobs})
 
 
-@router.get("/get-company-applicants")
-def get_company_applicants(company_id: str, job_id: str | None = None):
-    applicants = company_service.list_company_applicants(company_id, job_id=job_id)
-    return {"company_id": company_id, "job_id": job_id, "applicants": applicants}
+@router.get("/get-company-applicants", response_model=None)
+async def get_company_applicants(company_id: str, job_id: str | None = None):
+    applicants = await run_in_threadpool(company_service.list_company_applicants, company_id, job_id=job_id)
+    return ORJSONResponse({"company_id": company_id, "job_id": job_id, "applicants": applicants})
 
 
 @router.post("/score-applicants")
-def score_applicants(company_id: str, job_id: str | None = None, batch_size: int = 5, offset: int = 0):
+def score_applicants(
+    company_id: str,
+    job_id: str | None = None,
+    batch_size: int = 5,
+    offset: int = 0,
+    mode: str = "sync",
+):
     result = company_service.score_unrated_applicants(
         company_id, 
         job_id=job_id,
         batch_size=batch_size,
         offset=offset,
+        mode=mode,
     )
     resp = {
         "company_id": company_id,
@@ -128,6 +132,8 @@ def score_applicants(company_id: str, job_id: str | None = None, batch_size: int
     }
     if result.get("scoring_errors"):
         resp["scoring_errors"] = result["scoring_errors"]
+    if result.get("batch_id"):
+        resp["batch_id"] = result["batch_id"]
     return resp
 
 
@@ -185,39 +191,42 @@ def get_agent_chats(company_id: str):
     return {"company_id": company_id, "chats": result}
 
 
-@router.get("/agent-messages")
-def get_agent_messages(company_id: str, chat_id: Optional[str] = None):
-    rows = database.get_agent_messages(company_id, chat_id=chat_id)
-    result = []
-    for row in rows:
-        candidates_raw = row.get("candidates") or "[]"
-        try:
-            candidates = _json.loads(candidates_raw) if isinstance(candidates_raw, str) else []
-        except Exception:
-            candidates = []
-        result.append({
+@router.get("/agent-messages", response_model=None)
+async def get_agent_messages(company_id: str, chat_id: Optional[str] = None):
+    rows = await run_in_threadpool(database.get_agent_messages, company_id, chat_id=chat_id)
+    # candidates is validated JSON text from SQLite; orjson embeds it as-is instead of parsing and re-encoding.
+    result = [
+        {
             "id": row["id"],
             "chat_id": row.get("chat_id") or "",
             "role": row["role"],
             "content": row["content"],
-            "candidates": candidates,
+            "candidates": orjson.Fragment(row["candidates"]),
             "report_metadata": row.get("report_metadata") or "",
-        })
-    return {"company_id": company_id, "chat_id": chat_id, "messages": result}
+        }
+        for row in rows
+    ]
+    # Returned as a response directly: jsonable_encoder does not know about orjson.Fragment.
+    return ORJSONResponse({"company_id": company_id, "chat_id": chat_id, "messages": result})
 
 
 @router.post("/agent-messages")
 def save_agent_messages(payload: SaveAgentMessagesRequest):
-    for msg in payload.messages:
-        database.save_agent_message(
-            company_id=msg.company_id,
-            chat_id=msg.chat_id,
-            message_id=msg.message_id,
-            role=msg.role,
-            content=msg.content,
-            candidates=msg.candidates or "[]",
-            report_metadata=msg.report_metadata or "",
-        )
+    database.save_agent_messages_bulk(
+        [
+            (
+                msg.message_id,
+                msg.company_id,
+                msg.chat_id,
+                msg.role,
+                msg.content,
+                msg.candidates or "[]",
+                "",
+                msg.report_metadata or "",
+            )
+            for msg in payload.messages
+        ]
+    )
     return {"status": "ok", "count": len(payload.messages)}
 
 
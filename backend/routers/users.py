@@ -1,19 +1,26 @@
 """User (applicant) routes."""
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from schemas.user import ApplyJobRequest, UpdateProfileRequest, UpdateUserProfileRequest
 from services import user as user_service
 import database
-import pdf_utils
+
+try:
+    import pybase64 as base64  # SIMD decoder; same API as the stdlib module
+except ImportError:
+    import base64
 
 router = APIRouter(tags=["users"])
 
+MAX_PDF_BYTES = 20 * 1024 * 1024
+
 
 @router.get("/profile/{user_id}")
-def get_profile(user_id: str):
-    profile = user_service.get_user_profile(user_id)
+async def get_profile(user_id: str):
+    profile = await run_in_threadpool(user_service.get_user_profile, user_id)
     return {"user_id": user_id, "profile": profile}
 
 
@@ -24,13 +31,13 @@ def update_profile(user_id: str, payload: UpdateProfileRequest):
 
 
 @router.get("/get-matched-jobs")
-def get_matched_jobs(user_id: str):
-    matched_jobs = user_service.get_matched_jobs(user_id)
+async def get_matched_jobs(user_id: str):
+    matched_jobs = await run_in_threadpool(user_service.get_matched_jobs, user_id)
     return {"user_id": user_id, "matched_jobs": matched_jobs}
 
 
 @router.get("/get-user-interviews")
-def get_user_interviews(user_id: str):
+async def get_user_interviews(user_id: str):
     interviews = user_service.get_user_interviews(user_id)
     return {"user_id": user_id, "interviews": interviews}
 
@@ -42,34 +49,38 @@ def apply_job(payload: ApplyJobRequest):
 
 
 @router.get("/resume/{user_id}")
-def get_resume(user_id: str):
-    user = database.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    resume_pdf = user.get("resume_pdf")
-    if not resume_pdf:
+async def get_resume(user_id: str):
+    stream = database.stream_resume_pdf(user_id)
+    resume = await run_in_threadpool(next, stream)
+    if not resume or not resume[1]:
+        await run_in_threadpool(stream.close)
+        if not resume:
+            raise HTTPException(status_code=404, detail="User not found")
         raise HTTPException(status_code=404, detail="No resume PDF found for this user")
 
-    filename = f'{(user.get("name") or "resume").replace(" ", "_")}_resume.pdf'
-    return Response(
-        content=resume_pdf,
+    name, size = resume
+    filename = f'{(name or "resume").replace(" ", "_")}_resume.pdf'
+    return StreamingResponse(
+        stream,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        headers={
+            "Content-Disposition": f'inline; filename="{filename}"',
+            "Content-Length": str(size),
+        },
     )
 
 
 @router.get("/applications/{user_id}")
-def get_applications(user_id: str):
-    if not database.get_user_by_id(user_id):
+async def get_applications(user_id: str):
+    applications = await run_in_threadpool(database.get_user_applications_checked, user_id)
+    if applications is None:
         raise HTTPException(status_code=404, detail="User not found")
-    applications = database.get_user_applications(user_id)
     return {"user_id": user_id, "applications": applications}
 
 
 @router.get("/user-profile")
-def get_user_profile(user_id: str):
-    return user_service.get_user_profile(user_id)
+async def get_user_profile(user_id: str):
+    return await run_in_threadpool(user_service.get_user_profile, user_id)
 
 
 @router.put("/user-profile")
@@ -83,16 +94,17 @@ class UploadResumeRequest(BaseModel):
 
 
 @router.post("/users/upload-resume/{user_id}")
-def upload_resume(user_id: str, payload: UploadResumeRequest):
+async def upload_resume(user_id: str, payload: UploadResumeRequest):
     """Upload a new resume PDF and extract text."""
-    import base64
-    
-    user = database.get_user_by_id(user_id)
-    if not user:
+    # Reject oversized uploads from the encoded length before spending time decoding them.
+    if len(payload.pdf_base64) * 3 // 4 > MAX_PDF_BYTES:
+        raise HTTPException(status_code=413, detail="PDF exceeds 20 MB limit")
+
+    if not await run_in_threadpool(database.user_exists, user_id):
         raise HTTPException(status_code=404, detail="User not found")
     
     try:
-        pdf_bytes = base64.b64decode(payload.pdf_base64)
+        pdf_bytes = await run_in_threadpool(base64.b64decode, payload.pdf_base64)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid PDF base64")
     
@@ -100,10 +112,11 @@ def upload_resume(user_id: str, payload: UploadResumeRequest):
         raise HTTPException(status_code=400, detail="Empty PDF")
     
     # Extract text from PDF
-    resume_text = pdf_utils.extract_pdf_text(pdf_bytes)
+    resume_text = await run_in_threadpool(user_service.extract_resume_text, pdf_bytes)
     
     # Update user with new PDF and extracted text
-    success = database.update_user(
+    success = await run_in_threadpool(
+        database.update_user,
         user_id=user_id,
         resume_pdf=pdf_bytes,
         resume_text=resume_text,
@@ -2,6 +2,7 @@
 import json
 import sys
 from pathlib import Path
+from uuid import uuid4
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
@@ -95,37 +96,63 @@ def seed_google_intern_applicants() -> None:
 
     job_id = get_or_create_intern_job_id(company_id)
 
-    created_users = 0
-    created_applications = 0
-
-    for i in range(1, NUM_APPLICANTS + 1):
-        name = f"Intern Candidate {i:02d}"
-        email = f"google.intern{i:02d}@hireup.dev"
-
-        user = database.get_user_by_email(email)
-        if user:
-            user_id = user["id"]
-        else:
-            created = database.create_user(
-                email=email,
-                password="password",
-                name=name,
-                objective="Seeking a software engineering internship.",
-                interests=json.dumps(["Software Engineering", "Computer Science"]),
-            )
-            if not created:
-                print(f"  ✗ Failed to create user: {email}")
-                continue
-            user_id = created["id"]
-            created_users += 1
-
-        if database.check_application_exists(user_id, job_id):
-            continue
+    applicants = [
+        (f"Intern Candidate {i:02d}", f"google.intern{i:02d}@hireup.dev")
+        for i in range(1, NUM_APPLICANTS + 1)
+    ]
+    emails = [email for _, email in applicants]
+    placeholders = ",".join("?" * len(emails))
+    interests = json.dumps(["Software Engineering", "Computer Science"])
+    # Every seeded applicant shares the same password, so one bcrypt round covers all of them.
+    password_hash = database.hash_password("password")
 
-        database.create_application(user_id, job_id)
-        created_applications += 1
+    with database.get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        user_ids = {
+            row["email"]: row["id"]
+            for row in conn.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})", emails)
+        }
+        new_users = []
+        for name, email in applicants:
+            if email in user_ids:
+                continue
+            user_ids[email] = str(uuid4())
+            new_users.append(
+                (
+                    user_ids[email],
+                    email,
+                    password_hash,
+                    name,
+                    "Seeking a software engineering internship.",
+                    interests,
+                )
+            )
+        conn.executemany(
+            """
+            INSERT INTO users (
+                id, email, password_hash, name, objective, resume, resume_text, interests, career_objective,
+                grad_date, linkedin_url, github_url
+            ) VALUES (?, ?, ?, ?, ?, '', '', ?, '', '', '', '')
+            """,
+            new_users,
+        )
+
+        applied = {
+            row["user_id"]
+            for row in conn.execute("SELECT user_id FROM applications WHERE job_id = ?", (job_id,))
+        }
+        to_apply = [(name, email) for name, email in applicants if user_ids[email] not in applied]
+        conn.executemany(
+            "INSERT INTO applications (id, user_id, job_id, status, technical_score) VALUES (?, ?, ?, 'submitted', NULL)",
+            [(str(uuid4()), user_ids[email], job_id) for _, email in to_apply],
+        )
+
+    for name, email in to_apply:
         print(f"  ✓ Applied: {name} ({email})")
 
+    created_users = len(new_users)
+    created_applications = len(to_apply)
+
     print(
         f"\n✅ Google Intern seed complete: "
         f"{created_users} users created, {created_applications} applications created."
@@ -0,0 +1,124 @@
+"""Seed 12 existing applicants to each of Jane Street's seeded positions."""
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import database
+
+QUANT_RESEARCHER_JOB = {
+    "title": "Quantitative Researcher",
+    "description": "Apply quantitative methods and programming to research trading strategies. Work on modeling, data analysis, and building tools for research and trading.",
+    "skills": ["Python", "Statistics", "Machine Learning", "C++", "Probability"],
+    "location": "New York, NY",
+    "salary_range": "$200k-$400k",
+}
+
+SOFTWARE_ENGINEERING_INTERN_JOB = {
+    "title": "Software Engineering Intern",
+    "description": (
+        "Build and improve internal trading systems and developer tools. "
+        "Work with engineers on production systems, data pipelines, and performance-critical services."
+    ),
+    "skills": ["Python", "Java", "C++", "Algorithms", "Distributed Systems"],
+    "location": "New York, NY",
+    "salary_range": "$120k-$180k",
+}
+
+JOBS = [QUANT_RESEARCHER_JOB, SOFTWARE_ENGINEERING_INTERN_JOB]
+
+# Shared by every job so sqlite3's statement cache prepares it once per connection.
+# RETURNING yields a row only when the insert happened, so duplicates need no separate probe.
+_SQL_INSERT_APPLICATION = """
+    INSERT INTO applications (id, user_id, job_id, status, technical_score) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT DO NOTHING
+    RETURNING user_id
+"""
+
+
+def _seed_job(conn: sqlite3.Connection, company_id: str, job: dict, log: list[str]) -> None:
+    """Find or create one job and apply up to 12 new users to it, appending progress lines to `log`."""
+    job_row = conn.execute(
+        """
+        SELECT id FROM jobs
+        WHERE company_id = ? AND title = ?
+        """,
+        (company_id, job["title"]),
+    ).fetchone()
+
+    if job_row:
+        job_id = job_row["id"]
+        log.append(f"Found existing job: {job['title']}")
+    else:
+        job_id = str(uuid4())
+        conn.execute(
+            """
+            INSERT INTO jobs (id, company_id, title, description, skills, location, salary_range)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job_id,
+                company_id,
+                job["title"],
+                job["description"],
+                json.dumps(job["skills"]),
+                job["location"],
+                job["salary_range"],
+            ),
+        )
+        log.append(f"Created job: {job['title']}")
+
+    # Get 12 users who have not yet applied to this job
+    rows = conn.execute(
+        """
+        SELECT u.id, COALESCE(NULLIF(u.name, ''), NULLIF(u.email, ''), u.id) AS display
+        FROM users u
+        WHERE NOT EXISTS (
+            SELECT 1 FROM applications a WHERE a.user_id = u.id AND a.job_id = ?
+        )
+        LIMIT 12
+        """,
+        (job_id,),
+    ).fetchall()
+
+    # sqlite3.Row already supports lookup by column name, and LIMIT caps the count, so the rows are used as-is.
+    users = rows
+
+    if len(users) < 12:
+        log.append(f"Only {len(users)} users available (need 12). Create more users first.")
+
+    # The query above already excludes existing applicants; the UNIQUE(user_id, job_id)
+    # index turns any race into a skipped row instead of needing a per-user existence check.
+    created = 0
+    for u in users:
+        if conn.execute(_SQL_INSERT_APPLICATION, (str(uuid4()), u["id"], job_id, "submitted", None)).fetchone():
+            created += 1
+            log.append(f"  ✓ Applied: {u['display']}")
+    log.append(f"\n✅ {created} applicants applied to Jane Street {job['title']}")
+
+
+def seed_jane_street_jobs(jobs: list[dict] = JOBS) -> None:
+    """Seed 12 applicants from the DB to each Jane Street job in `jobs`."""
+    database.init_db()
+
+    company_id = database.get_company_id_by_name("Jane Street")
+    if not company_id:
+        print("Jane Street not found. Run seed_data.py first.")
+        return
+
+    # One connection and one transaction for every job; get_conn() commits on exit
+    # and rolls back if anything raises. Output is held until after the commit so
+    # terminal writes don't stretch the write transaction.
+    log: list[str] = []
+    with database.get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for job in jobs:
+            _seed_job(conn, company_id, job, log)
+    print("\n".join(log))
+
+
+if __name__ == "__main__":
+    seed_jane_street_jobs()
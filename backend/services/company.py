@@ -1,20 +1,63 @@
 """Company business logic."""
 from __future__ import annotations
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import heapq
 import importlib.util
 import json
+import math
 import os
+import queue
+import random
 import re
 import sqlite3
+import threading
+import time
 import urllib.error
 import urllib.request
+import zlib
+from collections import Counter, OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Annotated, Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
 
 import numpy as np
+import orjson
 from fastapi import HTTPException
+from pydantic import BaseModel, BeforeValidator, TypeAdapter, ValidationError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer
+except ImportError:
+    sparse = None
+    CountVectorizer = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 try:
     from . import database
@@ -24,13 +67,86 @@ except ImportError:
 
 # In-memory state for interview workflow/analytics.
 _interview_lists: Dict[str, List[str]] = {}
-_interview_feedback: List[Dict] = []
-_agent_queries_by_company: Dict[str, int] = {}
-_activities_by_company: Dict[str, List[Dict[str, str]]] = {}
+# Feedback entries keyed by job_id, matching how _interview_lists is keyed.
+_feedback_by_job: Dict[str, List[Dict]] = {}
+_agent_queries_by_company: Counter[str] = Counter()
+# Counter += is still a read-modify-write, and handlers run on the threadpool.
+_agent_queries_lock = threading.Lock()
+_activities_by_company: Dict[str, deque[Dict[str, Any]]] = {}
+_activities_lock = threading.Lock()
+
+# Activity entries are persisted off the request path: _add_activity only enqueues, and a
+# daemon thread writes whatever has accumulated every ACTIVITY_FLUSH_INTERVAL_SECONDS.
+ACTIVITY_HISTORY_SIZE = 256
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 1.0
+_activity_queue: queue.SimpleQueue[tuple[str, str, str, int]] = queue.SimpleQueue()
+_activity_flusher: threading.Thread | None = None
+_activity_pending = threading.Event()
+# Serializes writers so a shutdown flush waits for (rather than races) the flusher thread.
+_activity_write_lock = threading.Lock()
 
 _VECDB_PATH = Path(__file__).resolve().parents[2] / "two-tower" / "two_tower_vecdb.sqlite"
 _EMBED_INIT_PATH = Path(__file__).resolve().parents[2] / "two-tower" / "embedding_initializer.py"
 
+# One long-lived vecdb connection per thread; reopening the file per lookup dominated vector fetches.
+_vec_local = threading.local()
+
+# Shared embedding initializer, built on first use. _initializer_failed records a failed build so
+# later cache misses don't re-exec the module (e.g. when OPENAI_API_KEY is missing).
+_initializer = None
+_initializer_failed = False
+_initializer_lock = threading.Lock()
+
+# OpenAI chat responses keyed by request-body hash: in-process LRU in front of the openai_cache table.
+OPENAI_CACHE_TTL_SECONDS = 24 * 60 * 60
+_OPENAI_MEMO_SIZE = 256
+_openai_memo: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_openai_memo_lock = threading.Lock()
+
+# Keep-alive client reused for every OpenAI call (skips a TCP+TLS handshake per request).
+_OPENAI_BASE_URL = "https://api.openai.com"
+_openai_http = None
+_openai_http_lock = threading.Lock()
+
+# (job_id, user_id) pairs a score_unrated_applicants call is currently scoring (this process only).
+_scoring_inflight: set[tuple[str, str]] = set()
+_scoring_inflight_lock = threading.Lock()
+
+# Cap on in-flight OpenAI requests during an async fan-out (score_unrated / custom reports).
+OPENAI_MAX_CONCURRENCY = 20
+
+# Rate limits and transient server errors are retried before a caller falls back to local ranking.
+OPENAI_MAX_ATTEMPTS = 4
+OPENAI_MAX_RETRY_WAIT_SECONDS = 30.0
+_OPENAI_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_SQL_FETCH_JOB_VECTOR = "SELECT 'j', id, vector_blob, vector_json, vector_i8 FROM job_vectors WHERE id = ?"
+_SQL_FETCH_USER_VECTORS = (
+    "SELECT 'u', id, vector_blob, vector_json, vector_i8 FROM user_vectors WHERE id IN ({placeholders})"
+)
+_SQL_FETCH_JOB_VECTOR_I8 = "SELECT vector_i8 FROM job_vectors WHERE id = ?"
+_SQL_FETCH_USER_VECTORS_I8 = (
+    "SELECT id, vector_i8 FROM user_vectors WHERE vector_i8 IS NOT NULL AND id IN ({placeholders})"
+)
+# Stays well under SQLite's bound-parameter limit.
+_VEC_FETCH_CHUNK = 500
+
+# Normalized vectors by (kind, id). Only hits are cached; vectors for ids initialized here are
+# only ever missing before, and the TTL bounds staleness from offline embedding updates.
+# The "job_i8"/"user_i8" kinds hold the quantized vectors loaded alongside them, with
+# _NO_I8_VECTOR recording rows that have none so they aren't re-queried every batch.
+VECTOR_CACHE_TTL_SECONDS = 300.0
+_VECTOR_CACHE_SIZE = 4096
+_NO_I8_VECTOR = np.empty(0, dtype=np.int8)
+_vector_cache: OrderedDict[tuple[str, str], tuple[float, np.ndarray]] = OrderedDict()
+_vector_cache_lock = threading.Lock()
+
+# Company and job rows by (kind, id), so the existence checks at the top of most handlers skip
+# SQLite. Writes made through this module invalidate their entry; the TTL covers everything else.
+ENTITY_CACHE_TTL_SECONDS = 30.0
+_ENTITY_CACHE_SIZE = 10000
+_entity_cache: OrderedDict[tuple[str, str], tuple[float, Dict[str, Any]]] = OrderedDict()
+_entity_cache_lock = threading.Lock()
+
 STATUS_SUBMITTED = "submitted"
 STATUS_REJECTED_PRE = "rejected_pre_interview"
 STATUS_IN_PROGRESS = "in_progress"
@@ -58,19 +174,101 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _ns_to_iso(ts_ns: int) -> str:
+    """time.time_ns() value -> the same ISO-8601 text _utc_now_iso produces (integer math, no float rounding)."""
+    return (_UNIX_EPOCH + timedelta(microseconds=ts_ns // 1000)).isoformat()
+
+
+def _iso_to_ns(value: str) -> int:
+    return (datetime.fromisoformat(value) - _UNIX_EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def _company_activities(company_id: str) -> deque[Dict[str, Any]]:
+    """The company's recent activity, seeded from the database the first time this process sees it.
+    Entries hold a raw "ts_ns" timestamp; it is only formatted when persisted or returned."""
+    activities = _activities_by_company.get(company_id)
+    if activities is not None:
+        return activities
+    with _activities_lock:
+        if company_id not in _activities_by_company:
+            _activities_by_company[company_id] = deque(
+                (
+                    {"action": row["action"], "detail": row["detail"], "ts_ns": _iso_to_ns(row["time"])}
+                    for row in database.get_recent_company_activities(company_id, ACTIVITY_HISTORY_SIZE)
+                ),
+                maxlen=ACTIVITY_HISTORY_SIZE,
+            )
+        return _activities_by_company[company_id]
+
+
+def flush_activities() -> None:
+    """Write every queued activity entry now. Runs at interpreter exit; short-lived scripts that
+    record activity should call it before returning so nothing is left in the queue."""
+    with _activity_write_lock:
+        rows = []
+        while True:
+            try:
+                rows.append(_activity_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not rows:
+            return
+        try:
+            database.save_company_activities_bulk(
+                [(company_id, action, detail, _ns_to_iso(ts_ns)) for company_id, action, detail, ts_ns in rows]
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to persist {len(rows)} activity entries: {e}", flush=True)
+
+
+atexit.register(flush_activities)
+
+
+def _flush_activities_forever() -> None:
+    # Entries stay in the queue while this thread sleeps, so flush_activities() at exit still sees them.
+    while True:
+        _activity_pending.wait()
+        time.sleep(ACTIVITY_FLUSH_INTERVAL_SECONDS)
+        _activity_pending.clear()
+        flush_activities()
+
+
 def _add_activity(company_id: str, action: str, detail: str) -> None:
-    _activities_by_company.setdefault(company_id, []).append(
-        {"action": action, "detail": detail, "time": _utc_now_iso()}
-    )
+    global _activity_flusher
+    ts_ns = time.time_ns()
+    _company_activities(company_id).append({"action": action, "detail": detail, "ts_ns": ts_ns})
+    _activity_queue.put_nowait((company_id, action, detail, ts_ns))
+    _activity_pending.set()
+    if _activity_flusher is None:
+        with _activities_lock:
+            if _activity_flusher is None:
+                _activity_flusher = threading.Thread(
+                    target=_flush_activities_forever, name="activity-flush", daemon=True
+                )
+                _activity_flusher.start()
 
 
 def _normalize(v: np.ndarray) -> np.ndarray:
-    norm = float(np.linalg.norm(v))
+    norm = float(np.sqrt(np.vdot(v, v)))
     if norm <= 1e-12:
         return v.astype(np.float32)
     return (v / norm).astype(np.float32)
 
 
+def _normalize_rows(m: np.ndarray) -> np.ndarray:
+    """Row-wise _normalize in one pass; near-zero rows are left as-is. Modifies `m` in place."""
+    sq = np.einsum("ij,ij->i", m, m)
+    big = sq > 1e-24
+    inv = np.ones_like(sq)
+    inv[big] = 1.0 / np.sqrt(sq[big])
+    m *= inv[:, None]
+    return m
+
+
+@functools.lru_cache(maxsize=1)
 def _load_embedding_initializer_cls():
     spec = importlib.util.spec_from_file_location("two_tower_embedding_initializer", _EMBED_INIT_PATH)
     if spec is None or spec.loader is None:
@@ -81,58 +279,292 @@ def _load_embedding_initializer_cls():
 
 
 def _build_embedding_initializer():
-    try:
-        initializer_cls = _load_embedding_initializer_cls()
-        return initializer_cls(vecdb_path=_VECDB_PATH)
-    except Exception:
-        return None
+    global _initializer, _initializer_failed
+    with _initializer_lock:
+        if _initializer is None and not _initializer_failed:
+            try:
+                initializer_cls = _load_embedding_initializer_cls()
+                _initializer = initializer_cls(vecdb_path=_VECDB_PATH)
+            except Exception:
+                _initializer_failed = True
+        return _initializer
 
 
 def _parse_skills(skills_raw: Any) -> List[str]:
     if isinstance(skills_raw, list):
         return [str(skill).strip() for skill in skills_raw if str(skill).strip()]
     if isinstance(skills_raw, str):
-        try:
-            parsed = json.loads(skills_raw)
-            if isinstance(parsed, list):
-                return [str(skill).strip() for skill in parsed if str(skill).strip()]
-        except Exception:
-            return []
+        return [str(skill).strip() for skill in _parse_interests(skills_raw) if str(skill).strip()]
     return []
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_interests(raw: str) -> tuple:
+    """JSON list text -> tuple of items (empty if invalid). Memoized: scoring re-parses the same strings on every pass."""
+    try:
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return ()
+    return tuple(parsed) if isinstance(parsed, list) else ()
+
+
+def _vec_conn() -> sqlite3.Connection:
+    conn = getattr(_vec_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(_VECDB_PATH, check_same_thread=False)
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            """
+        )
+        # The two-tower writers fill these; make sure the columns exist before selecting them.
+        for table in ("job_vectors", "user_vectors"):
+            for column in ("vector_blob BLOB", "vector_i8 BLOB", "vector_scale REAL"):
+                try:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass
+        _vec_local.conn = conn
+    return conn
+
+
+def _decode_vector(blob: bytes | None, vector_json: str | None) -> np.ndarray:
+    # Rows written before vector_blob existed only carry the JSON form.
+    if blob is not None:
+        return np.frombuffer(blob, dtype=np.float32)
+    return np.array(json.loads(vector_json), dtype=np.float32)
+
+
+def _vector_cache_get(kind: str, ids: List[str]) -> Dict[str, np.ndarray]:
+    now = time.monotonic()
+    found: Dict[str, np.ndarray] = {}
+    with _vector_cache_lock:
+        for entity_id in ids:
+            key = (kind, entity_id)
+            hit = _vector_cache.get(key)
+            if hit is None:
+                continue
+            if hit[0] <= now:
+                del _vector_cache[key]
+                continue
+            _vector_cache.move_to_end(key)
+            found[entity_id] = hit[1]
+    return found
+
+
+def _vector_cache_put(kind: str, vectors: Dict[str, np.ndarray]) -> None:
+    expires_at = time.monotonic() + VECTOR_CACHE_TTL_SECONDS
+    with _vector_cache_lock:
+        for entity_id, vec in vectors.items():
+            # Cached arrays are shared between requests; make accidental in-place edits fail loudly.
+            vec.setflags(write=False)
+            _vector_cache[(kind, entity_id)] = (expires_at, vec)
+            _vector_cache.move_to_end((kind, entity_id))
+        while len(_vector_cache) > _VECTOR_CACHE_SIZE:
+            _vector_cache.popitem(last=False)
+
+
+def _cached_entity(kind: str, entity_id: str, load: Callable[[str], Dict[str, Any] | None]) -> Dict[str, Any] | None:
+    key = (kind, entity_id)
+    now = time.monotonic()
+    with _entity_cache_lock:
+        hit = _entity_cache.get(key)
+        if hit is not None and hit[0] > now:
+            _entity_cache.move_to_end(key)
+            return dict(hit[1])
+    # Misses aren't cached: a company or job created elsewhere must be visible immediately.
+    row = load(entity_id) if entity_id else None
+    if row is not None:
+        with _entity_cache_lock:
+            _entity_cache[key] = (now + ENTITY_CACHE_TTL_SECONDS, row)
+            _entity_cache.move_to_end(key)
+            while len(_entity_cache) > _ENTITY_CACHE_SIZE:
+                _entity_cache.popitem(last=False)
+        row = dict(row)
+    return row
+
+
+def _cached_company(company_id: str) -> Dict[str, Any] | None:
+    return _cached_entity("company", company_id, database.get_company_by_id)
+
+
+def _cached_job(job_id: str) -> Dict[str, Any] | None:
+    return _cached_entity("job", job_id, database.get_job)
+
+
+def _cached_jobs(job_ids: List[str]) -> Dict[str, Dict[str, Any] | None]:
+    """_cached_job for several ids, loading every miss with one query."""
+    now = time.monotonic()
+    found: Dict[str, Dict[str, Any] | None] = {}
+    with _entity_cache_lock:
+        for job_id in job_ids:
+            hit = _entity_cache.get(("job", job_id))
+            if hit is not None and hit[0] > now:
+                _entity_cache.move_to_end(("job", job_id))
+                found[job_id] = dict(hit[1])
+    missing = [job_id for job_id in job_ids if job_id not in found]
+    loaded = database.get_jobs_by_ids(missing)
+    if loaded:
+        with _entity_cache_lock:
+            for job_id, row in loaded.items():
+                _entity_cache[("job", job_id)] = (now + ENTITY_CACHE_TTL_SECONDS, row)
+                _entity_cache.move_to_end(("job", job_id))
+            while len(_entity_cache) > _ENTITY_CACHE_SIZE:
+                _entity_cache.popitem(last=False)
+    for job_id in missing:
+        row = loaded.get(job_id)
+        found[job_id] = dict(row) if row is not None else None
+    return found
+
+
+def _invalidate_cached(kind: str, entity_id: str) -> None:
+    with _entity_cache_lock:
+        _entity_cache.pop((kind, entity_id), None)
+
+
 def _fetch_job_vector(job_id: str) -> np.ndarray | None:
+    if not job_id:
+        return None
+    cached = _vector_cache_get("job", [job_id])
+    if cached:
+        return cached[job_id]
+    vec, _ = _load_vectors(job_id, [])
+    if vec is not None:
+        _vector_cache_put("job", {job_id: vec})
+    return vec
+
+
+def _fetch_user_vectors(user_ids: List[str]) -> Dict[str, np.ndarray]:
+    if not user_ids:
+        return {}
+    vectors = _vector_cache_get("user", user_ids)
+    missing = [uid for uid in user_ids if uid not in vectors]
+    if missing:
+        _, loaded = _load_vectors(None, missing)
+        _vector_cache_put("user", loaded)
+        vectors.update(loaded)
+    return vectors
+
+
+def _load_vectors(job_id: str | None, user_ids: List[str]) -> tuple[np.ndarray | None, Dict[str, np.ndarray]]:
+    """Load and normalize a job vector and/or user vectors from the vecdb in one round trip per chunk."""
+    if not _VECDB_PATH.exists() or (not job_id and not user_ids):
+        return None, {}
+    try:
+        conn = _vec_conn()
+        rows = []
+        # The job lookup rides along with the first chunk of users (or runs alone if there are none).
+        start = 0
+        while True:
+            chunk = user_ids[start : start + _VEC_FETCH_CHUNK]
+            parts: List[str] = []
+            params: List[str] = []
+            if job_id and start == 0:
+                parts.append(_SQL_FETCH_JOB_VECTOR)
+                params.append(job_id)
+            if chunk:
+                parts.append(_SQL_FETCH_USER_VECTORS.format(placeholders=",".join(["?"] * len(chunk))))
+                params.extend(chunk)
+            if not parts:
+                break
+            rows.extend(conn.execute(" UNION ALL ".join(parts), params).fetchall())
+            start += _VEC_FETCH_CHUNK
+            if start >= len(user_ids):
+                break
+
+        job_vec: np.ndarray | None = None
+        ids: List[str] = []
+        mats: List[np.ndarray] = []
+        i8_by_kind: Dict[str, Dict[str, np.ndarray]] = {"job_i8": {}, "user_i8": {}}
+        for kind, entity_id, blob, vector_json, blob_i8 in rows:
+            i8_by_kind["job_i8" if kind == "j" else "user_i8"][str(entity_id)] = (
+                np.frombuffer(blob_i8, dtype=np.int8) if blob_i8 is not None else _NO_I8_VECTOR
+            )
+            try:
+                vec = _decode_vector(blob, vector_json)
+            except Exception:
+                continue
+            if kind == "j":
+                job_vec = _normalize(vec)
+            else:
+                ids.append(str(entity_id))
+                mats.append(vec)
+        for i8_kind, i8_vecs in i8_by_kind.items():
+            if i8_vecs:
+                _vector_cache_put(i8_kind, i8_vecs)
+        if not mats:
+            return job_vec, {}
+        try:
+            m = _normalize_rows(np.stack(mats).astype(np.float32))
+        except ValueError:
+            # Mixed dimensions can't be stacked; normalize one by one.
+            return job_vec, {uid: _normalize(vec) for uid, vec in zip(ids, mats)}
+        return job_vec, {uid: m[i] for i, uid in enumerate(ids)}
+    except Exception:
+        return None, {}
+
+
+def _fetch_job_and_user_vectors(job_id: str, user_ids: List[str]) -> tuple[np.ndarray | None, Dict[str, np.ndarray]]:
+    """_fetch_job_vector + _fetch_user_vectors, loading whatever isn't cached with a single query."""
+    job_vec = _vector_cache_get("job", [job_id]).get(job_id) if job_id else None
+    user_vecs = _vector_cache_get("user", user_ids) if user_ids else {}
+    missing = [uid for uid in user_ids if uid not in user_vecs]
+    need_job = bool(job_id) and job_vec is None
+    if need_job or missing:
+        loaded_job, loaded_users = _load_vectors(job_id if need_job else None, missing)
+        if loaded_job is not None:
+            _vector_cache_put("job", {job_id: loaded_job})
+            job_vec = loaded_job
+        _vector_cache_put("user", loaded_users)
+        user_vecs.update(loaded_users)
+    return job_vec, user_vecs
+
+
+def _fetch_job_vector_i8(job_id: str) -> np.ndarray | None:
     if not _VECDB_PATH.exists() or not job_id:
         return None
     try:
-        with sqlite3.connect(_VECDB_PATH) as conn:
-            row = conn.execute(
-                "SELECT vector_json FROM job_vectors WHERE id = ?",
-                (job_id,),
-            ).fetchone()
-        if not row:
+        row = _vec_conn().execute(_SQL_FETCH_JOB_VECTOR_I8, (job_id,)).fetchone()
+        if not row or row[0] is None:
             return None
-        return _normalize(np.array(json.loads(row[0]), dtype=np.float32))
+        return np.frombuffer(row[0], dtype=np.int8)
     except Exception:
         return None
 
 
-def _fetch_user_vectors(user_ids: List[str]) -> Dict[str, np.ndarray]:
+def _fetch_vectors_i8(job_id: str, user_ids: List[str]) -> tuple[np.ndarray | None, Dict[str, np.ndarray]]:
+    """Quantized job and user vectors, from the vector cache where _load_vectors already put them;
+    only ids it hasn't seen (e.g. vectors initialized in this process) go to the vecdb."""
+    job_i8 = _vector_cache_get("job_i8", [job_id]).get(job_id)
+    if job_i8 is None:
+        job_i8 = _fetch_job_vector_i8(job_id)
+        _vector_cache_put("job_i8", {job_id: job_i8 if job_i8 is not None else _NO_I8_VECTOR})
+    user_i8 = _vector_cache_get("user_i8", user_ids)
+    missing = [uid for uid in user_ids if uid not in user_i8]
+    if missing:
+        loaded = _fetch_user_vectors_i8(missing)
+        loaded.update({uid: _NO_I8_VECTOR for uid in missing if uid not in loaded})
+        _vector_cache_put("user_i8", loaded)
+        user_i8.update(loaded)
+    if job_i8 is None or not job_i8.size:
+        return None, {}
+    return job_i8, {uid: vec for uid, vec in user_i8.items() if vec.size}
+
+
+def _fetch_user_vectors_i8(user_ids: List[str]) -> Dict[str, np.ndarray]:
     if not _VECDB_PATH.exists() or not user_ids:
         return {}
     try:
-        placeholders = ",".join(["?"] * len(user_ids))
-        with sqlite3.connect(_VECDB_PATH) as conn:
-            rows = conn.execute(
-                f"SELECT id, vector_json FROM user_vectors WHERE id IN ({placeholders})",
-                tuple(user_ids),
-            ).fetchall()
+        conn = _vec_conn()
         vectors: Dict[str, np.ndarray] = {}
-        for row in rows:
-            try:
-                vectors[str(row[0])] = _normalize(np.array(json.loads(row[1]), dtype=np.float32))
-            except Exception:
-                continue
+        for start in range(0, len(user_ids), _VEC_FETCH_CHUNK):
+            chunk = user_ids[start : start + _VEC_FETCH_CHUNK]
+            sql = _SQL_FETCH_USER_VECTORS_I8.format(placeholders=",".join(["?"] * len(chunk)))
+            for row in conn.execute(sql, tuple(chunk)):
+                vectors[str(row[0])] = np.frombuffer(row[1], dtype=np.int8)
         return vectors
     except Exception:
         return {}
@@ -172,9 +604,83 @@ def _cosine_to_unit_interval(score: float) -> float:
 
 
 def _two_tower_score(user_vec: np.ndarray, job_vec: np.ndarray) -> float:
+    if simsimd is not None:
+        return _cosine_to_unit_interval(float(simsimd.dot(user_vec, job_vec)))
     return _cosine_to_unit_interval(float(np.dot(user_vec, job_vec)))
 
 
+if numba is not None:
+
+    @numba.njit(fastmath=True, cache=True)
+    def _two_tower_batch_scores_nb(user_matrix, job_vec):
+        # Dot product, clamp and [-1, 1] -> [0, 1] mapping fused into one pass per row.
+        n, d = user_matrix.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            acc = 0.0
+            for k in range(d):
+                acc += user_matrix[i, k] * job_vec[k]
+            if acc > 1.0:
+                acc = 1.0
+            elif acc < -1.0:
+                acc = -1.0
+            out[i] = (acc + 1.0) * 0.5
+        return out
+
+
+def _two_tower_batch_scores(user_matrix: np.ndarray, job_vec: np.ndarray) -> np.ndarray:
+    """_two_tower_score for every row of `user_matrix` with a single matrix-vector product."""
+    if simsimd is not None:
+        # SIMD dot kernels; avoids BLAS dispatch overhead, which dominates at these sizes.
+        scores = np.asarray(simsimd.cdist(user_matrix, job_vec.reshape(1, -1), metric="dot"), dtype=np.float32).ravel()
+    elif numba is not None:
+        # The compiled loop doesn't bounds-check, so reject mismatches the way matmul would.
+        if user_matrix.ndim != 2 or user_matrix.shape[1] != job_vec.shape[0]:
+            raise ValueError("user and job vector dimensions differ")
+        return _two_tower_batch_scores_nb(user_matrix, job_vec)
+    else:
+        scores = user_matrix @ job_vec
+    np.clip(scores, -1.0, 1.0, out=scores)
+    scores += 1.0
+    scores *= 0.5
+    return scores
+
+
+def _two_tower_scores_i8(job_id: str, user_ids: List[str]) -> Dict[str, float]:
+    """Two-tower scores from the int8-quantized vectors via SimSIMD's i8 cosine kernel.
+
+    Returns only the users that have a quantized vector; empty if SimSIMD isn't installed.
+    """
+    if simsimd is None:
+        return {}
+    job_i8, user_i8 = _fetch_vectors_i8(job_id, user_ids)
+    if job_i8 is None:
+        return {}
+    user_i8 = {uid: vec for uid, vec in user_i8.items() if vec.shape == job_i8.shape}
+    if not user_i8:
+        return {}
+    ids = list(user_i8)
+    distances = simsimd.cdist(np.stack([user_i8[uid] for uid in ids]), job_i8.reshape(1, -1), metric="cosine")
+    cosines = 1.0 - np.asarray(distances, dtype=np.float32).ravel()
+    return {uid: _cosine_to_unit_interval(float(c)) for uid, c in zip(ids, cosines)}
+
+
+def _two_tower_scores_by_user(user_vecs: Dict[str, np.ndarray], job_vec: np.ndarray) -> Dict[str, float]:
+    user_ids = list(user_vecs)
+    try:
+        scores = _two_tower_batch_scores(np.stack([user_vecs[uid] for uid in user_ids]), job_vec)
+    except ValueError:
+        # A stale vector with a different dimension; score pairwise so the rest still count.
+        out: Dict[str, float] = {}
+        for uid in user_ids:
+            try:
+                out[uid] = _two_tower_score(user_vecs[uid], job_vec)
+            except ValueError:
+                continue
+        return out
+    return dict(zip(user_ids, scores.tolist()))
+
+
 def _get_or_initialize_vectors_for_job(
     job: Dict[str, Any],
     app_by_user: Dict[str, Dict[str, Any]],
@@ -184,8 +690,7 @@ def _get_or_initialize_vectors_for_job(
         return None, {}
 
     user_ids = [uid for uid in app_by_user.keys() if uid]
-    job_vec = _fetch_job_vector(job_id)
-    user_vecs = _fetch_user_vectors(user_ids)
+    job_vec, user_vecs = _fetch_job_and_user_vectors(job_id, user_ids)
 
     if job_vec is not None and len(user_vecs) == len(user_ids):
         return job_vec, user_vecs
@@ -205,19 +710,20 @@ def _get_or_initialize_vectors_for_job(
             job_vec = None
 
     missing_user_ids = [uid for uid in user_ids if uid not in user_vecs]
-    for user_id in missing_user_ids:
-        user = database.get_user_by_id(user_id)
-        app = app_by_user.get(user_id)
+    if missing_user_ids:
+        users = database.get_users_by_ids(missing_user_ids)
+        items = [
+            (user_id, _user_payload_for_initializer(users.get(user_id), app_by_user.get(user_id)))
+            for user_id in missing_user_ids
+        ]
         try:
-            initializer.initialize_new_user(
-                user_id=user_id,
-                user_payload=_user_payload_for_initializer(user, app),
-            )
+            initializer.initialize_new_users_bulk(items)
         except Exception:
-            continue
+            pass
 
     if missing_user_ids:
-        user_vecs = _fetch_user_vectors(user_ids)
+        # Only the newly initialized ids need reading; the rest are already in hand.
+        user_vecs.update(_fetch_user_vectors(missing_user_ids))
 
     return job_vec, user_vecs
 
@@ -262,9 +768,6 @@ def create_session(login_data: Dict) -> Dict:
 
 def create_job_posting(job_data: Dict) -> str:
     company_id = job_data.get("company_id")
-    if not database.get_company_by_id(company_id):
-        raise HTTPException(status_code=404, detail="Company not found")
-
     skills = job_data.get("skills", [])
     if not isinstance(skills, list):
         raise HTTPException(status_code=400, detail="skills must be a list")
@@ -280,8 +783,9 @@ def create_job_posting(job_data: Dict) -> str:
     if not job_description:
         raise HTTPException(status_code=400, detail="description is required")
 
-    skills_str = json.dumps(cleaned_skills)
-    job_id = database.create_job(
+    skills_str = orjson.dumps(cleaned_skills).decode("utf-8")
+    # The company existence check happens inside the INSERT.
+    job_id = database.create_job_if_company_exists(
         company_id=company_id,
         title=job_title,
         description=job_description,
@@ -289,13 +793,15 @@ def create_job_posting(job_data: Dict) -> str:
         location=job_data.get("location", "Remote"),
         salary_range=job_data.get("salary_range", "TBD"),
     )
+    if job_id is None:
+        raise HTTPException(status_code=404, detail="Company not found")
     _add_activity(company_id, "New job posting live", f"{job_title or 'New role'} is now open.")
     return job_id
 
 
 def update_job_posting(job_data: Dict) -> Dict[str, Any]:
     company_id = job_data.get("company_id")
-    if not database.get_company_by_id(company_id):
+    if not _cached_company(company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     job_id = str(job_data.get("job_id", "")).strip()
@@ -322,23 +828,22 @@ def update_job_posting(job_data: Dict) -> Dict[str, Any]:
         job_id=job_id,
         title=job_title,
         description=job_description,
-        skills=json.dumps(cleaned_skills),
+        skills=orjson.dumps(cleaned_skills).decode("utf-8"),
         location=str(job_data.get("location", "Remote")).strip() or "Remote",
         salary_range=str(job_data.get("salary_range", "TBD")).strip() or "TBD",
     )
     if not updated:
         raise HTTPException(status_code=404, detail="Job not found for company")
+    _invalidate_cached("job", job_id)
 
-    try:
-        updated["skills"] = json.loads(updated.get("skills", "[]"))
-    except Exception:
-        updated["skills"] = []
+    # The stored column is just cleaned_skills serialized, so there is nothing to parse back.
+    updated["skills"] = cleaned_skills
     _add_activity(company_id, "Job posting updated", f"{job_title} details were updated.")
     return updated
 
 
 def delete_job_posting(company_id: str, job_id: str) -> Dict[str, Any]:
-    if not database.get_company_by_id(company_id):
+    if not _cached_company(company_id):
         raise HTTPException(status_code=404, detail="Company not found")
     if not job_id:
         raise HTTPException(status_code=400, detail="job_id is required")
@@ -346,37 +851,183 @@ def delete_job_posting(company_id: str, job_id: str) -> Dict[str, Any]:
     closed = database.close_job_for_company(company_id=company_id, job_id=job_id)
     if not closed:
         raise HTTPException(status_code=404, detail="Job not found for company")
+    _invalidate_cached("job", job_id)
     _add_activity(company_id, "Job posting closed", f"{closed.get('title', 'Job')} was closed.")
     return closed
 
 
-def _rank_candidates(prompt: str, candidates: List[Dict]) -> List[Dict]:
-    """Local fallback ranker using both skills and resume text."""
-    stop_words = {
-        "the", "and", "for", "with", "that", "this", "from", "have", "has", "are", "you",
-        "your", "top", "best", "give", "show", "find", "applicant", "applicants", "candidate",
-        "candidates",
-    }
-    prompt_terms = {
-        term.lower()
-        for term in re.findall(r"[a-zA-Z0-9\+#\.]+", prompt)
-        if len(term) > 2 and term.lower() not in stop_words
-    }
+_RANK_STOP_WORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "from", "have", "has", "are", "you",
+    "your", "top", "best", "give", "show", "find", "applicant", "applicants", "candidate",
+    "candidates",
+})
+_RANK_TERM_RE = re.compile(r"[a-zA-Z0-9\+#\.]+")
+# Applied to the lowercased prompt; {3,} does the old len(term) > 2 filter inside the scan.
+_RANK_PROMPT_TERM_RE = re.compile(r"[a-z0-9\+#\.]{3,}")
+
+# Skill IDF across every user's interests, rebuilt at most every RANK_IDF_TTL_SECONDS,
+# with an Aho-Corasick automaton over the same skill names when pyahocorasick is installed.
+RANK_IDF_TTL_SECONDS = 300.0
+_rank_idf: tuple[float, Dict[str, float], float, Any] | None = None
+_rank_idf_lock = threading.Lock()
+
+
+def _skill_idf() -> tuple[Dict[str, float], float, Any]:
+    """Smoothed IDF per lowercased skill, log((N + 1) / (df + 1)) + 1, the weight for unseen skills,
+    and the skill-name automaton (None without pyahocorasick).
+
+    A skill every candidate lists weighs ~1 (the old flat weight); rare skills weigh more.
+    """
+    global _rank_idf
+    now = time.monotonic()
+    with _rank_idf_lock:
+        if _rank_idf is not None and now - _rank_idf[0] < RANK_IDF_TTL_SECONDS:
+            return _rank_idf[1:]
+        all_interests = database.get_all_candidate_skills()
+        df: Counter[str] = Counter()
+        for interests in all_interests:
+            df.update({str(s).strip().lower() for s in _parse_interests(interests)} - {""})
+        n = len(all_interests)
+        idf = {skill: math.log((n + 1) / (count + 1)) + 1.0 for skill, count in df.items()}
+
+        automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for skill in idf:
+                if len(skill) > 2:
+                    automaton.add_word(skill, skill)
+            automaton = automaton if len(automaton) else None
+            if automaton is not None:
+                automaton.make_automaton()
+
+        _rank_idf = (now, idf, math.log(n + 1) + 1.0, automaton)
+        return _rank_idf[1:]
+
+
+def _rank_prompt_terms(prompt: str, skill_automaton: Any) -> set[str]:
+    """Prompt tokens (3+ chars, no stop words), plus any known skill names, multi-word ones
+    included, found in one Aho-Corasick pass."""
+    prompt_lower = (prompt or "").lower()
+    terms = {term for term in _RANK_PROMPT_TERM_RE.findall(prompt_lower) if term not in _RANK_STOP_WORDS}
+    if skill_automaton is not None:
+        for end, skill in skill_automaton.iter(prompt_lower):
+            start = end - len(skill) + 1
+            # Whole-word hits only: "java" must not match inside "javascript".
+            if (start == 0 or not prompt_lower[start - 1].isalnum()) and (
+                end + 1 == len(prompt_lower) or not prompt_lower[end + 1].isalnum()
+            ):
+                terms.add(skill)
+    return terms
+
+
+@functools.lru_cache(maxsize=8192)
+def _skill_terms(skills: tuple) -> frozenset[str]:
+    """Lowercased skill set for the rankers. Memoized: the same pools are ranked on every query."""
+    return frozenset(str(s).lower() for s in skills)
+
+
+def _candidate_skill_terms(candidate: Dict) -> frozenset[str]:
+    skills = tuple(candidate.get("skills") or ())
+    try:
+        return _skill_terms(skills)
+    except TypeError:  # unhashable items from malformed interests JSON
+        return frozenset(str(s).lower() for s in skills)
+
+
+def _rank_candidates(prompt: str, candidates: List[Dict], top_k: int | None = None) -> List[Dict]:
+    """Local fallback ranker using both skills and resume text. With top_k, only the best top_k are returned."""
+    idf, unseen_idf, skill_automaton = _skill_idf()
+    prompt_terms = _rank_prompt_terms(prompt, skill_automaton)
+    if CountVectorizer is not None and prompt_terms and candidates:
+        skill_hits_all, skill_weight_all, resume_hits_all = _rank_term_matches_sparse(
+            prompt_terms, candidates, idf, unseen_idf
+        )
+    else:
+        n = len(candidates)
+        skill_hits_all, skill_weight_all, resume_hits_all = [0] * n, [0.0] * n, [0] * n
+        # With no prompt terms every candidate scores zero, so skip tokenizing their resumes at all.
+        for i, candidate in enumerate(candidates if prompt_terms else ()):
+            skills = _candidate_skill_terms(candidate)
+            # Most candidates share no skill with the prompt; isdisjoint stops at the first hit
+            # and never allocates the intersection set for them.
+            if not prompt_terms.isdisjoint(skills):
+                matched_skills = prompt_terms & skills
+                skill_hits_all[i] = len(matched_skills)
+                skill_weight_all[i] = sum(idf.get(skill, unseen_idf) for skill in matched_skills)
+            # Same whole-token matching as the vectorizer: one tokenize, then a hash intersection.
+            resume_tokens = set(_RANK_TERM_RE.findall((candidate.get("resume_text") or "").lower()))
+            resume_hits_all[i] = len(prompt_terms & resume_tokens)
+
+    scores = [round(float(skill_weight_all[i]) * 5 + int(resume_hits_all[i]), 2) for i in range(len(candidates))]
+    # Same order as a stable descending sort; nlargest only keeps a top_k-sized heap.
+    if top_k is None:
+        order = sorted(range(len(candidates)), key=scores.__getitem__, reverse=True)
+    else:
+        order = heapq.nlargest(top_k, range(len(candidates)), key=scores.__getitem__)
+
+    # Result dicts (and reasoning strings) are only built for candidates being returned.
     ranked = []
-    for candidate in candidates:
-        skills = {str(s).lower() for s in candidate.get("skills", [])}
-        resume_text = (candidate.get("resume_text") or "").lower()
-        skill_hits = len(prompt_terms & skills)
-        resume_hits = sum(1 for term in prompt_terms if term in resume_text)
-        score = skill_hits * 5 + resume_hits
+    for i in order:
+        skill_hits = int(skill_hits_all[i])
+        resume_hits = int(resume_hits_all[i])
         ranked.append(
             {
-                **candidate,
-                "score": score,
+                **candidates[i],
+                "score": scores[i],
                 "reasoning": f"Local ranking: {skill_hits} skill matches and {resume_hits} resume-text matches.",
             }
         )
-    return sorted(ranked, key=lambda x: x["score"], reverse=True)
+    return ranked
+
+
+def _rank_term_matches_sparse(
+    prompt_terms: set[str],
+    candidates: List[Dict],
+    idf: Dict[str, float],
+    unseen_idf: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-candidate (skill hits, IDF-weighted skill hits, resume hits) from two sparse
+    candidate x prompt-term matrices, so the whole pool is scored with mat-vecs."""
+    vocab = sorted(prompt_terms)
+    # One C-level tokenize + vocabulary lookup over every resume instead of per-term substring scans.
+    vectorizer = CountVectorizer(
+        vocabulary=vocab,
+        lowercase=True,
+        token_pattern=_RANK_TERM_RE.pattern,
+        binary=True,
+    )
+    resume_matrix = vectorizer.transform([candidate.get("resume_text") or "" for candidate in candidates])
+
+    column = {term: j for j, term in enumerate(vocab)}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, candidate in enumerate(candidates):
+        for skill in _candidate_skill_terms(candidate):
+            j = column.get(skill)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+    skill_matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=resume_matrix.shape
+    )
+    weights = np.array([idf.get(term, unseen_idf) for term in vocab], dtype=np.float64)
+
+    skill_hits = np.asarray(skill_matrix.sum(axis=1)).ravel()
+    resume_hits = np.asarray(resume_matrix.sum(axis=1)).ravel()
+    return skill_hits, skill_matrix @ weights, resume_hits
+
+
+@functools.lru_cache(maxsize=4)
+def _load_env_file(path_str: str, mtime: float) -> Dict[str, str]:
+    """Parsed KEY=VALUE pairs of one .env file; `mtime` is part of the cache key so edits are picked up."""
+    values: Dict[str, str] = {}
+    for line in Path(path_str).read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            continue
+        k, v = stripped.split("=", 1)
+        values.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+    return values
 
 
 def _read_env_value(key: str) -> str:
@@ -391,158 +1042,491 @@ def _read_env_value(key: str) -> str:
         Path(__file__).resolve().parents[2] / ".env",  # repo-root/.env
     ]
     for env_path in env_paths:
-        if not env_path.exists():
-            continue
         try:
-            for line in env_path.read_text(encoding="utf-8").splitlines():
-                stripped = line.strip()
-                if not stripped or stripped.startswith("#") or "=" not in stripped:
-                    continue
-                k, v = stripped.split("=", 1)
-                if k.strip() == key:
-                    return v.strip().strip('"').strip("'")
+            value = _load_env_file(str(env_path), env_path.stat().st_mtime).get(key)
         except Exception:
             continue
+        if value is not None:
+            return value
     return ""
 
 
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _find_first_json_object(text: str) -> str | None:
+    """Slice of `text` spanning the first balanced {...}, skipping braces inside strings."""
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
 def _extract_json_blob(text: str) -> Dict:
     """Extract and parse first JSON object from model output."""
     text = text.strip()
     if not text:
         return {}
     try:
-        return json.loads(text)
+        return orjson.loads(text)
     except Exception:
         pass
 
-    match = re.search(r"\{.*\}", text, flags=re.DOTALL)
+    candidate = _find_first_json_object(text)
+    if candidate is not None:
+        try:
+            return orjson.loads(candidate)
+        except Exception:
+            pass
+
+    match = _JSON_OBJECT_RE.search(text)
     if not match:
         return {}
     try:
-        return json.loads(match.group(0))
+        return orjson.loads(match.group(0))
     except Exception:
         return {}
 
 
-def _openai_rank_and_analyze_candidates(job: Dict, prompt: str, candidates: List[Dict]) -> List[Dict]:
-    """Use OpenAI to score candidates AND analyze their skills in one call."""
-    api_key = _read_env_value("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY not set")
+def _openai_cache_get(key: str) -> str | None:
+    now = time.time()
+    with _openai_memo_lock:
+        hit = _openai_memo.get(key)
+        if hit is not None and hit[0] > now:
+            _openai_memo.move_to_end(key)
+            return hit[1]
+    cached = database.get_cached_openai_response(key, OPENAI_CACHE_TTL_SECONDS)
+    if cached is None:
+        return None
+    content = zlib.decompress(cached[0]).decode("utf-8")
+    _openai_memo_put(key, content, cached[1] + OPENAI_CACHE_TTL_SECONDS)
+    return content
 
-    # Keep payload bounded for latency and token usage.
-    limited = candidates[:100]
-    candidate_payload = []
-    for c in limited:
-        candidate_payload.append(
-            {
-                "user_id": c.get("user_id", ""),
-                "resume_text": (c.get("resume_text") or "")[:10000],
-                "grad_date": c.get("grad_date", ""),
-                "linkedin_url": c.get("linkedin_url", ""),
-                "github_url": c.get("github_url", ""),
+
+def _openai_memo_put(key: str, content: str, expires_at: float) -> None:
+    with _openai_memo_lock:
+        _openai_memo[key] = (expires_at, content)
+        _openai_memo.move_to_end(key)
+        if len(_openai_memo) > _OPENAI_MEMO_SIZE:
+            _openai_memo.popitem(last=False)
+
+
+def _openai_cache_set(key: str, content: str) -> None:
+    created_at = database.put_cached_openai_response(key, zlib.compress(content.encode("utf-8")))
+    _openai_memo_put(key, content, created_at + OPENAI_CACHE_TTL_SECONDS)
+
+
+def _get_openai_http():
+    global _openai_http
+    with _openai_http_lock:
+        if _openai_http is None:
+            # Sized for the scoring thread pools: every worker keeps its connection warm between calls.
+            options = {
+                "base_url": _OPENAI_BASE_URL,
+                "timeout": httpx.Timeout(90, connect=5),
+                "limits": httpx.Limits(max_connections=32, max_keepalive_connections=32),
             }
-        )
+            try:
+                _openai_http = httpx.Client(http2=True, **options)
+            except ImportError:
+                # http2 needs the optional h2 package; keep-alive over HTTP/1.1 still helps.
+                _openai_http = httpx.Client(**options)
+        return _openai_http
 
-    system_msg = (
-        "You are a recruiting fit-scoring and skill analysis assistant. "
-        "For each candidate, provide TWO outputs: (1) fit score and reasoning, (2) skill breakdown. "
-        "CRITICAL: Score each candidate independently and absolutely against the job description. "
-        "Do NOT compare candidates to each other. Do NOT adjust scores based on the strength of other candidates in this batch. "
-        "A candidate's score should be the same whether they are scored alone or with 100 others. "
-        "Return strict JSON only with shape: "
-        '{"ranked":[{"user_id":"...","score":0,"reasoning":"...","skills":[{"name":"...","score":0}],"skill_summary":"..."}]}. '
-        "If profile metadata (grad_date, linkedin_url, github_url) appears inconsistent with resume_text, "
-        "explicitly flag it in reasoning using prefix 'DISCREPANCY FLAG:'. "
-        "For skills: analyze ONLY the job-required skills. Score each 0-100 based on resume evidence. "
-        "Provide a brief skill_summary (1-2 sentences) describing overall technical strengths."
-    )
-    user_msg = {
-        "job": {
-            "id": job.get("id"),
-            "title": job.get("title"),
-            "description": job.get("description"),
-            "skills": job.get("skills"),
-            "location": job.get("location"),
-        },
-        "prompt": prompt,
-        "candidates": candidate_payload,
-    }
 
-    body = json.dumps(
-        {
-            "model": "gpt-5.2",
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": json.dumps(user_msg)},
-            ],
-        }
-    ).encode("utf-8")
+def _openai_retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if the server sent one, else jittered 2**attempt."""
+    try:
+        wait = float(retry_after) if retry_after else None
+    except ValueError:
+        wait = None
+    if wait is None:
+        wait = 2 ** attempt + random.uniform(0, 1)
+    return min(wait, OPENAI_MAX_RETRY_WAIT_SECONDS)
+
+
+def _openai_request_once(
+    api_key: str,
+    method: str,
+    path: str,
+    body: bytes | None,
+    content_type: str,
+) -> tuple[int, str | None, bytes]:
+    """One OpenAI API call -> (status, Retry-After header, body). Transport errors raise RuntimeError."""
+    headers = {"Authorization": f"Bearer {api_key}"}
+    if body is not None:
+        headers["Content-Type"] = content_type
+    if httpx is not None:
+        try:
+            resp = _get_openai_http().request(method, path, headers=headers, content=body)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI request failed: {e}")
+        return resp.status_code, resp.headers.get("retry-after"), resp.content
 
     req = urllib.request.Request(
-        "https://api.openai.com/v1/chat/completions",
+        f"{_OPENAI_BASE_URL}{path}",
         data=body,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
+        headers=headers,
+        method=method,
     )
 
     try:
         with urllib.request.urlopen(req, timeout=90) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
+            return resp.status, None, resp.read()
     except urllib.error.HTTPError as e:
-        details = e.read().decode("utf-8", errors="ignore")
-        raise RuntimeError(f"OpenAI HTTP {e.code}: {details[:300]}")
+        return e.code, e.headers.get("retry-after"), e.read()
     except Exception as e:
         raise RuntimeError(f"OpenAI request failed: {e}")
 
-    content = (
-        payload.get("choices", [{}])[0]
-        .get("message", {})
-        .get("content", "")
+
+def _openai_request(
+    api_key: str,
+    method: str,
+    path: str,
+    body: bytes | None = None,
+    content_type: str = "application/json",
+) -> bytes:
+    """Raw OpenAI API call returning the response body; HTTP and transport errors raise RuntimeError.
+
+    Rate limits and 5xx responses are retried with backoff before giving up.
+    """
+    for attempt in range(OPENAI_MAX_ATTEMPTS):
+        status, retry_after, content = _openai_request_once(api_key, method, path, body, content_type)
+        if status < 400:
+            return content
+        if status not in _OPENAI_RETRY_STATUSES or attempt == OPENAI_MAX_ATTEMPTS - 1:
+            break
+        time.sleep(_openai_retry_delay(attempt, retry_after))
+    raise RuntimeError(f"OpenAI HTTP {status}: {content.decode('utf-8', errors='ignore')[:300]}")
+
+
+def _openai_post(api_key: str, body: bytes) -> Dict:
+    raw = _openai_request(api_key, "POST", "/v1/chat/completions", body)
+    try:
+        return orjson.loads(raw)
+    except Exception as e:
+        raise RuntimeError(f"OpenAI request failed: {e}")
+
+
+def _openai_upload_batch_file(api_key: str, jsonl: bytes) -> str:
+    """Upload a Batch API input file (multipart/form-data, purpose=batch). Returns the file id."""
+    boundary = uuid4().hex
+    body = b"".join(
+        (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n'.encode(),
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="fit_scoring.jsonl"\r\n'
+            "Content-Type: application/jsonl\r\n\r\n".encode(),
+            jsonl,
+            f"\r\n--{boundary}--\r\n".encode(),
+        )
     )
+    raw = _openai_request(api_key, "POST", "/v1/files", body, f"multipart/form-data; boundary={boundary}")
+    return orjson.loads(raw)["id"]
+
+
+async def _openai_post_async(client, api_key: str, body: bytes) -> Dict:
+    """_openai_post on an httpx.AsyncClient; without httpx, runs the blocking call in a worker thread."""
+    if client is None:
+        return await asyncio.to_thread(_openai_post, api_key, body)
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+    for attempt in range(OPENAI_MAX_ATTEMPTS):
+        try:
+            resp = await client.post("/v1/chat/completions", headers=headers, content=body)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI request failed: {e}")
+        if resp.status_code not in _OPENAI_RETRY_STATUSES or attempt == OPENAI_MAX_ATTEMPTS - 1:
+            break
+        await asyncio.sleep(_openai_retry_delay(attempt, resp.headers.get("retry-after")))
+    if resp.status_code >= 400:
+        raise RuntimeError(f"OpenAI HTTP {resp.status_code}: {resp.text[:300]}")
+    try:
+        return resp.json()
+    except Exception as e:
+        raise RuntimeError(f"OpenAI request failed: {e}")
+
+
+def _run_openai_fanout(calls: List[Callable[[Any], Awaitable[Any]]]) -> List[Any]:
+    """Run OpenAI coroutines concurrently on one event loop sharing one pooled async HTTP client.
+
+    Each call receives the client (None without httpx). Returns results in input order, with
+    exceptions returned in place rather than raised. Must be called from a thread with no running loop.
+    """
+
+    if not calls:
+        return []
+
+    async def runner() -> List[Any]:
+        semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        client = None
+        if httpx is not None:
+            client = httpx.AsyncClient(
+                base_url=_OPENAI_BASE_URL,
+                timeout=90,
+                limits=httpx.Limits(max_connections=64, keepalive_expiry=120),
+            )
+
+        async def guarded(call):
+            async with semaphore:
+                return await call(client)
+
+        try:
+            return await asyncio.gather(*(guarded(call) for call in calls), return_exceptions=True)
+        finally:
+            if client is not None:
+                await client.aclose()
+
+    return asyncio.run(runner())
+
+
+# User-message keys that vary between requests for the same job; they go in the last message.
+_OPENAI_VARIABLE_KEYS = ("candidates", "candidate")
+
+
+def _openai_chat_request(system_msg: str, user_msg: Dict) -> Dict:
+    """Chat-completion request dict. The user message (mostly resume text) is serialized exactly once, with orjson.
+
+    The job/prompt part of `user_msg` is sent as its own message ahead of the candidates, with sorted
+    keys, so every batch for a job shares a byte-identical prefix for OpenAI's automatic prompt cache.
+    """
+    stable = {k: v for k, v in user_msg.items() if k not in _OPENAI_VARIABLE_KEYS}
+    variable = {k: user_msg[k] for k in _OPENAI_VARIABLE_KEYS if k in user_msg}
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": orjson.dumps(stable, option=orjson.OPT_SORT_KEYS).decode("utf-8")},
+    ]
+    if variable:
+        messages.append({"role": "user", "content": orjson.dumps(variable).decode("utf-8")})
+    return {
+        "model": "gpt-5.2",
+        "response_format": {"type": "json_object"},
+        "messages": messages,
+    }
+
+
+def _openai_chat_body(system_msg: str, user_msg: Dict) -> bytes:
+    return orjson.dumps(_openai_chat_request(system_msg, user_msg))
+
+
+def _openai_chat_content(api_key: str, body: bytes) -> str:
+    """POST a chat completion and return the message content, cached by a hash of the request body.
+
+    The body carries the model, prompts, job and every candidate field sent, so any change misses.
+    """
+    key = hashlib.sha256(body).hexdigest()
+    cached = _openai_cache_get(key)
+    if cached is not None:
+        return cached
+    return _openai_store_content(key, _openai_post(api_key, body))
+
+
+async def _openai_chat_content_async(client, api_key: str, body: bytes) -> str:
+    key = hashlib.sha256(body).hexdigest()
+    cached = _openai_cache_get(key)
+    if cached is not None:
+        return cached
+    return _openai_store_content(key, await _openai_post_async(client, api_key, body))
+
+
+def _openai_store_content(key: str, payload: Dict) -> str:
+    content = payload.get("choices", [{}])[0].get("message", {}).get("content", "")
+    # Only keep answers that parse, so a malformed reply isn't replayed for a day.
+    if _extract_json_blob(content):
+        _openai_cache_set(key, content)
+    return content
+
+
+def _openai_candidate_payload(candidates: List[Dict]) -> List[Dict]:
+    return [
+        {
+            "user_id": c.get("user_id", ""),
+            "resume_text": (c.get("resume_text") or "")[:10000],
+            "grad_date": c.get("grad_date", ""),
+            "linkedin_url": c.get("linkedin_url", ""),
+            "github_url": c.get("github_url", ""),
+        }
+        for c in candidates
+    ]
+
+
+def _openai_job_summary(job: Dict) -> Dict:
+    return {
+        "id": job.get("id"),
+        "title": job.get("title"),
+        "description": job.get("description"),
+        "skills": job.get("skills"),
+        "location": job.get("location"),
+    }
+
+
+def _openai_score(
+    system_msg: str,
+    user_msg: Dict,
+    limited: List[Dict],
+    score_key: str = "score",
+    reasoning_key: str = "reasoning",
+    default_reasoning: str = "Model-ranked candidate.",
+    with_skills: bool = False,
+) -> List[Dict]:
+    """Run one candidate-scoring chat completion and merge the ranked output back onto `limited`.
+
+    Results are keyed by `score_key`/`reasoning_key` and sorted best first; `with_skills` also
+    copies the per-candidate skill breakdown and summary.
+    """
+    api_key = _openai_api_key()
+    content = _openai_chat_content(api_key, _openai_chat_body(system_msg, user_msg))
+    return _openai_merge_ranked(content, limited, score_key, reasoning_key, default_reasoning, with_skills)
+
+
+async def _openai_score_async(
+    client,
+    system_msg: str,
+    user_msg: Dict,
+    limited: List[Dict],
+    score_key: str = "score",
+    reasoning_key: str = "reasoning",
+    default_reasoning: str = "Model-ranked candidate.",
+    with_skills: bool = False,
+) -> List[Dict]:
+    """Async _openai_score for use inside _run_openai_fanout."""
+    api_key = _openai_api_key()
+    content = await _openai_chat_content_async(client, api_key, _openai_chat_body(system_msg, user_msg))
+    return _openai_merge_ranked(content, limited, score_key, reasoning_key, default_reasoning, with_skills)
+
+
+def _openai_api_key() -> str:
+    api_key = _read_env_value("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not set")
+    return api_key
+
+
+def _clamp_score(value: Any) -> int:
+    try:
+        return max(0, min(100, int(value)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _str_or_none(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+class _RankedItem(BaseModel):
+    """One entry of the model's "ranked" list; validated in pydantic-core instead of a Python dict walk.
+    Every field is coerced rather than rejected, so one odd item can't fail the whole list."""
+
+    user_id: Annotated[str, BeforeValidator(lambda v: str(v if v is not None else "").strip())] = ""
+    score: Annotated[int, BeforeValidator(_clamp_score)] = 0
+    reasoning: Annotated[str | None, BeforeValidator(_str_or_none)] = None
+    skills: Annotated[list, BeforeValidator(lambda v: v if isinstance(v, list) else [])] = []
+    skill_summary: Annotated[str | None, BeforeValidator(_str_or_none)] = ""
+
+
+_RANKED_ITEMS = TypeAdapter(List[_RankedItem])
+
+
+def _openai_merge_ranked(
+    content: str,
+    limited: List[Dict],
+    score_key: str,
+    reasoning_key: str,
+    default_reasoning: str,
+    with_skills: bool,
+) -> List[Dict]:
     parsed = _extract_json_blob(content)
     ranked = parsed.get("ranked", [])
     if not isinstance(ranked, list):
         raise RuntimeError("OpenAI response missing ranked list")
 
+    try:
+        items = _RANKED_ITEMS.validate_python([item for item in ranked if isinstance(item, dict)])
+    except ValidationError as e:
+        raise RuntimeError(f"OpenAI ranked list failed validation: {e.error_count()} error(s): {e.errors()[:1]}")
+
     by_user = {c.get("user_id"): c for c in limited}
     merged = []
-    for item in ranked:
-        if not isinstance(item, dict):
-            continue
-        user_id = str(item.get("user_id", "")).strip()
-        if not user_id or user_id not in by_user:
+    for item in items:
+        base = by_user.get(item.user_id)
+        if base is None:
             continue
-        base = by_user[user_id]
-        score = item.get("score", 0)
-        try:
-            score = int(score)
-        except Exception:
-            score = 0
-        merged.append(
-            {
-                "user_id": user_id,
-                "name": base.get("name") or "",
-                "skills": base.get("skills", []),
-                "score": max(0, min(100, score)),
-                "reasoning": str(item.get("reasoning", "Model-ranked candidate.")),
-                "skill_analysis": item.get("skills", []),
-                "skill_summary": str(item.get("skill_summary", "")),
-            }
-        )
+        entry = {
+            "user_id": item.user_id,
+            "name": base.get("name") or "",
+            "skills": base.get("skills", []),
+            score_key: item.score,
+            reasoning_key: item.reasoning if item.reasoning is not None else default_reasoning,
+        }
+        if with_skills:
+            entry["skill_analysis"] = item.skills
+            entry["skill_summary"] = item.skill_summary or ""
+        merged.append(entry)
 
     if not merged:
         raise RuntimeError("OpenAI returned no usable candidate rankings")
 
-    merged.sort(key=lambda x: x["score"], reverse=True)
+    merged.sort(key=lambda x: x[score_key], reverse=True)
     return merged
 
 
+def _openai_rank_and_analyze_candidates(job: Dict, prompt: str, candidates: List[Dict]) -> List[Dict]:
+    """Use OpenAI to score candidates AND analyze their skills in one call."""
+    return _openai_score(*_rank_and_analyze_messages(job, prompt, candidates), with_skills=True)
+
+
+async def _openai_rank_and_analyze_candidates_async(
+    client, job: Dict, prompt: str, candidates: List[Dict]
+) -> List[Dict]:
+    return await _openai_score_async(client, *_rank_and_analyze_messages(job, prompt, candidates), with_skills=True)
+
+
+def _rank_and_analyze_messages(job: Dict, prompt: str, candidates: List[Dict]) -> tuple[str, Dict, List[Dict]]:
+    # Keep payload bounded for latency and token usage.
+    limited = candidates[:100]
+
+    system_msg = (
+        "You are a recruiting fit-scoring and skill analysis assistant. "
+        "For each candidate, provide TWO outputs: (1) fit score and reasoning, (2) skill breakdown. "
+        "CRITICAL: Score each candidate independently and absolutely against the job description. "
+        "Do NOT compare candidates to each other. Do NOT adjust scores based on the strength of other candidates in this batch. "
+        "A candidate's score should be the same whether they are scored alone or with 100 others. "
+        "Return strict JSON only with shape: "
+        '{"ranked":[{"user_id":"...","score":0,"reasoning":"...","skills":[{"name":"...","score":0}],"skill_summary":"..."}]}. '
+        "If profile metadata (grad_date, linkedin_url, github_url) appears inconsistent with resume_text, "
+        "explicitly flag it in reasoning using prefix 'DISCREPANCY FLAG:'. "
+        "For skills: analyze ONLY the job-required skills. Score each 0-100 based on resume evidence. "
+        "Provide a brief skill_summary (1-2 sentences) describing overall technical strengths."
+    )
+    user_msg = {
+        "job": _openai_job_summary(job),
+        "prompt": prompt,
+        "candidates": _openai_candidate_payload(limited),
+    }
+    return system_msg, user_msg, limited
+
+
 def _openai_hybrid_rank_candidates(
     job: Dict,
     job_prompt: str,
@@ -555,22 +1539,36 @@ def _openai_hybrid_rank_candidates(
     job posting providing baseline context for role alignment.
     Returns candidates with custom_fit_score, custom_fit_reasoning, and skill analysis.
     """
-    api_key = _read_env_value("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY not set")
+    return _openai_score(*_hybrid_rank_messages(job, job_prompt, custom_prompt, candidates), **_HYBRID_SCORE_KEYS)
+
 
+async def _openai_hybrid_rank_candidates_async(
+    client,
+    job: Dict,
+    job_prompt: str,
+    custom_prompt: str,
+    candidates: List[Dict],
+) -> List[Dict]:
+    return await _openai_score_async(
+        client, *_hybrid_rank_messages(job, job_prompt, custom_prompt, candidates), **_HYBRID_SCORE_KEYS
+    )
+
+
+_HYBRID_SCORE_KEYS = {
+    "score_key": "custom_fit_score",
+    "reasoning_key": "custom_fit_reasoning",
+    "default_reasoning": "Hybrid-ranked candidate.",
+    "with_skills": True,
+}
+
+
+def _hybrid_rank_messages(
+    job: Dict,
+    job_prompt: str,
+    custom_prompt: str,
+    candidates: List[Dict],
+) -> tuple[str, Dict, List[Dict]]:
     limited = candidates[:100]
-    candidate_payload = []
-    for c in limited:
-        candidate_payload.append(
-            {
-                "user_id": c.get("user_id", ""),
-                "resume_text": (c.get("resume_text") or "")[:10000],
-                "grad_date": c.get("grad_date", ""),
-                "linkedin_url": c.get("linkedin_url", ""),
-                "github_url": c.get("github_url", ""),
-            }
-        )
 
     system_msg = (
         "You are a recruiting fit-scoring and skill analysis assistant. "
@@ -583,122 +1581,27 @@ def _openai_hybrid_rank_candidates(
         "A candidate's score should be the same whether they are scored alone or with 100 others. "
         "Return strict JSON only with shape: "
         '{"ranked":[{"user_id":"...","score":0,"reasoning":"...","skills":[{"name":"...","score":0}],"skill_summary":"..."}]}. '
-        "In reasoning, explain how well they match the recruiter's criteria and the role context. "
-        "If profile metadata (grad_date, linkedin_url, github_url) appears inconsistent with resume_text, "
-        "explicitly flag it in reasoning using prefix 'DISCREPANCY FLAG:'. "
-        "For skills: analyze skills relevant to BOTH the job posting AND the recruiter's custom criteria. "
-        "Score each 0-100 based on resume evidence. "
-        "Provide a brief skill_summary (1-2 sentences) describing overall technical strengths."
-    )
-
-    user_msg = {
-        "job": {
-            "id": job.get("id"),
-            "title": job.get("title"),
-            "description": job.get("description"),
-            "skills": job.get("skills"),
-            "location": job.get("location"),
-        },
-        "job_prompt": job_prompt,
-        "custom_criteria": custom_prompt,
-        "candidates": candidate_payload,
-    }
-
-    body = json.dumps(
-        {
-            "model": "gpt-5.2",
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": json.dumps(user_msg)},
-            ],
-        }
-    ).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=body,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=90) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        details = e.read().decode("utf-8", errors="ignore")
-        raise RuntimeError(f"OpenAI HTTP {e.code}: {details[:300]}")
-    except Exception as e:
-        raise RuntimeError(f"OpenAI request failed: {e}")
-
-    content = (
-        payload.get("choices", [{}])[0]
-        .get("message", {})
-        .get("content", "")
-    )
-    parsed = _extract_json_blob(content)
-    ranked = parsed.get("ranked", [])
-    if not isinstance(ranked, list):
-        raise RuntimeError("OpenAI response missing ranked list")
-
-    by_user = {c.get("user_id"): c for c in limited}
-    merged = []
-    for item in ranked:
-        if not isinstance(item, dict):
-            continue
-        user_id = str(item.get("user_id", "")).strip()
-        if not user_id or user_id not in by_user:
-            continue
-        base = by_user[user_id]
-        
-        # Extract score (now just "score" instead of "final_score")
-        score = item.get("score", 0)
-        try:
-            score = int(score)
-        except Exception:
-            score = 0
-        
-        merged.append(
-            {
-                "user_id": user_id,
-                "name": base.get("name") or "",
-                "skills": base.get("skills", []),
-                "custom_fit_score": max(0, min(100, score)),
-                "custom_fit_reasoning": str(item.get("reasoning", "Hybrid-ranked candidate.")),
-                "skill_analysis": item.get("skills", []),
-                "skill_summary": str(item.get("skill_summary", "")),
-            }
-        )
-
-    if not merged:
-        raise RuntimeError("OpenAI returned no usable candidate rankings")
+        "In reasoning, explain how well they match the recruiter's criteria and the role context. "
+        "If profile metadata (grad_date, linkedin_url, github_url) appears inconsistent with resume_text, "
+        "explicitly flag it in reasoning using prefix 'DISCREPANCY FLAG:'. "
+        "For skills: analyze skills relevant to BOTH the job posting AND the recruiter's custom criteria. "
+        "Score each 0-100 based on resume evidence. "
+        "Provide a brief skill_summary (1-2 sentences) describing overall technical strengths."
+    )
 
-    merged.sort(key=lambda x: x["custom_fit_score"], reverse=True)
-    return merged
+    user_msg = {
+        "job": _openai_job_summary(job),
+        "job_prompt": job_prompt,
+        "custom_criteria": custom_prompt,
+        "candidates": _openai_candidate_payload(limited),
+    }
+    return system_msg, user_msg, limited
 
 
 def _openai_rank_candidates(job: Dict, prompt: str, candidates: List[Dict]) -> List[Dict]:
     """Use OpenAI chat completions to score candidates for a job."""
-    api_key = _read_env_value("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY not set")
-
     # Keep payload bounded for latency and token usage.
     limited = candidates[:100]
-    candidate_payload = []
-    for c in limited:
-        candidate_payload.append(
-            {
-                "user_id": c.get("user_id", ""),
-                "resume_text": (c.get("resume_text") or "")[:10000],
-                "grad_date": c.get("grad_date", ""),
-                "linkedin_url": c.get("linkedin_url", ""),
-                "github_url": c.get("github_url", ""),
-            }
-        )
 
     system_msg = (
         "You are a recruiting fit-scoring assistant. "
@@ -713,86 +1616,11 @@ def _openai_rank_candidates(job: Dict, prompt: str, candidates: List[Dict]) -> L
         "Scoring criteria: technical skill match, relevant experience, demonstrated expertise, and alignment with job requirements."
     )
     user_msg = {
-        "job": {
-            "id": job.get("id"),
-            "title": job.get("title"),
-            "description": job.get("description"),
-            "skills": job.get("skills"),
-            "location": job.get("location"),
-        },
+        "job": _openai_job_summary(job),
         "prompt": prompt,
-        "candidates": candidate_payload,
+        "candidates": _openai_candidate_payload(limited),
     }
-
-    body = json.dumps(
-        {
-            "model": "gpt-5.2",
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": json.dumps(user_msg)},
-            ],
-        }
-    ).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=body,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=90) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        details = e.read().decode("utf-8", errors="ignore")
-        raise RuntimeError(f"OpenAI HTTP {e.code}: {details[:300]}")
-    except Exception as e:
-        raise RuntimeError(f"OpenAI request failed: {e}")
-
-    content = (
-        payload.get("choices", [{}])[0]
-        .get("message", {})
-        .get("content", "")
-    )
-    parsed = _extract_json_blob(content)
-    ranked = parsed.get("ranked", [])
-    if not isinstance(ranked, list):
-        raise RuntimeError("OpenAI response missing ranked list")
-
-    by_user = {c.get("user_id"): c for c in limited}
-    merged = []
-    for item in ranked:
-        if not isinstance(item, dict):
-            continue
-        user_id = str(item.get("user_id", "")).strip()
-        if not user_id or user_id not in by_user:
-            continue
-        base = by_user[user_id]
-        score = item.get("score", 0)
-        try:
-            score = int(score)
-        except Exception:
-            score = 0
-        merged.append(
-            {
-                "user_id": user_id,
-                "name": base.get("name") or "",
-                "skills": base.get("skills", []),
-                "score": max(0, min(100, score)),
-                "reasoning": str(item.get("reasoning", "Model-ranked candidate.")),
-            }
-        )
-
-    if not merged:
-        raise RuntimeError("OpenAI returned no usable candidate rankings")
-
-    merged.sort(key=lambda x: x["score"], reverse=True)
-    return merged
+    return _openai_score(system_msg, user_msg, limited)
 
 
 def _openai_analyze_candidate_skills(
@@ -809,7 +1637,7 @@ def _openai_analyze_candidate_skills(
         raw_job_skills = job.get("skills", "[]")
         if isinstance(raw_job_skills, str):
             try:
-                raw_job_skills = json.loads(raw_job_skills)
+                raw_job_skills = orjson.loads(raw_job_skills)
             except Exception:
                 raw_job_skills = []
         if isinstance(raw_job_skills, list):
@@ -838,37 +1666,9 @@ def _openai_analyze_candidate_skills(
         ),
     }
 
-    body = json.dumps(
-        {
-            "model": "gpt-5.2",
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": json.dumps(user_msg)},
-            ],
-        }
-    ).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=body,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=90) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        details = e.read().decode("utf-8", errors="ignore")
-        raise RuntimeError(f"OpenAI HTTP {e.code}: {details[:300]}")
-    except Exception as e:
-        raise RuntimeError(f"OpenAI request failed: {e}")
+    body = _openai_chat_body(system_msg, user_msg)
 
-    content = payload.get("choices", [{}])[0].get("message", {}).get("content", "")
+    content = _openai_chat_content(api_key, body)
     parsed = _extract_json_blob(content)
     skills = parsed.get("skills", [])
     summary = str(parsed.get("summary", "")).strip()
@@ -890,67 +1690,66 @@ def _openai_analyze_candidate_skills(
     if not cleaned:
         raise RuntimeError("OpenAI returned no usable skill scores")
     if mode == "job_specific" and job_skill_targets:
-        allowed = {name.lower() for name in job_skill_targets}
-        filtered = [item for item in cleaned if item["name"].lower() in allowed]
-        by_name = {item["name"].lower(): item for item in filtered}
-        ordered: List[Dict[str, Any]] = []
-        for skill_name in job_skill_targets:
-            existing = by_name.get(skill_name.lower())
-            if existing:
-                ordered.append(existing)
-            else:
-                ordered.append({"name": skill_name, "score": 0})
-        cleaned = ordered
+        # Looking up each target is the filter: skills the job didn't ask for are never reached.
+        by_name = {item["name"].lower(): item for item in cleaned}
+        cleaned = [
+            by_name.get(skill_name.lower()) or {"name": skill_name, "score": 0}
+            for skill_name in job_skill_targets
+        ]
     else:
         cleaned.sort(key=lambda x: x["score"], reverse=True)
     return {"summary": summary, "skills": cleaned[:7]}
 
 
+# Tried in order, so "top N" still wins over "N candidates" anywhere in the prompt.
+_LIMIT_PATTERNS = (
+    re.compile(r"top\s+(\d+)"),  # "top 3", "top 5 applicants", "give me top 10"
+    re.compile(r"(\d+)\s+(?:applicants|candidates)"),  # "3 applicants", "5 candidates"
+    re.compile(r"best\s+(\d+)"),  # "best 7"
+)
+
+
 def _parse_limit_from_prompt(prompt: str) -> int | None:
     """Extract requested count from prompt, e.g. 'top 3', '5 applicants', 'best 10'."""
-    import re
     prompt_lower = (prompt or "").lower()
-    # "top 3", "top 5 applicants", "give me top 10"
-    m = re.search(r"top\s+(\d+)", prompt_lower)
-    if m:
-        return min(100, max(1, int(m.group(1))))
-    # "3 applicants", "5 candidates"
-    m = re.search(r"(\d+)\s+(?:applicants|candidates)", prompt_lower)
-    if m:
-        return min(100, max(1, int(m.group(1))))
-    # "best 7"
-    m = re.search(r"best\s+(\d+)", prompt_lower)
-    if m:
-        return min(100, max(1, int(m.group(1))))
+    for pattern in _LIMIT_PATTERNS:
+        m = pattern.search(prompt_lower)
+        if m:
+            return min(100, max(1, int(m.group(1))))
     return None
 
 
+def _row_to_candidate(row: tuple) -> Dict[str, Any]:
+    user_id, name, interests, resume_text, grad_date, linkedin_url, github_url = row
+    return {
+        "user_id": user_id,
+        "name": name,
+        "skills": list(_parse_interests(interests or "[]")),
+        "resume_text": resume_text,
+        "grad_date": grad_date,
+        "linkedin_url": linkedin_url,
+        "github_url": github_url,
+    }
+
+
 def get_top_candidates(job_id: str, prompt: str, limit: int | None = None) -> Dict:
-    job = database.get_job(job_id)
+    job = _cached_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     company_id = job.get("company_id", "")
     if company_id:
-        _agent_queries_by_company[company_id] = _agent_queries_by_company.get(company_id, 0) + 1
+        with _agent_queries_lock:
+            _agent_queries_by_company[company_id] += 1
 
-    applicants = list_company_applicants(company_id, job_id=job_id)
-    candidate_pool = [
-        {
-            "user_id": a.get("user_id", ""),
-            "name": a.get("user_name", ""),
-            "skills": a.get("skills", []),
-            "resume_text": a.get("resume_text", ""),
-            "grad_date": a.get("grad_date", ""),
-            "linkedin_url": a.get("linkedin_url", ""),
-            "github_url": a.get("github_url", ""),
-        }
-        for a in applicants
-        if a.get("user_id")
-    ]
+    # Slim projection: no fit/status/report columns, just what the rankers read.
+    candidate_pool = [_row_to_candidate(row) for row in database.get_candidate_pool(job_id) if row[0]]
     if not candidate_pool:
         return {"top_candidates": [], "ranking_source": "none", "ranking_error": ""}
 
+    n = limit if limit is not None else _parse_limit_from_prompt(prompt)
+    n = n or 12
+
     # Try OpenAI first; fall back to local overlap ranking for resilience.
     ranking_source = "openai"
     ranking_error = ""
@@ -959,12 +1758,10 @@ def get_top_candidates(job_id: str, prompt: str, limit: int | None = None) -> Di
     except Exception as exc:
         ranking_source = "fallback"
         ranking_error = str(exc)[:300]
-        ranked = _rank_candidates(prompt, candidate_pool)
-
-    n = limit if limit is not None else _parse_limit_from_prompt(prompt)
-    n = min(len(ranked), n) if n else min(len(ranked), 12)
+        ranked = _rank_candidates(prompt, candidate_pool, top_k=max(n, 0))
 
-    top_candidates = ranked[:n]
+    # The fallback ranker already stops at n, so only the model's full ranking needs trimming.
+    top_candidates = ranked[:n] if len(ranked) > n else ranked
     if company_id:
         _add_activity(
             company_id,
@@ -988,7 +1785,7 @@ def analyze_candidate_skills(company_id: str, user_id: str, job_id: str | None =
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found for company")
 
-    job = database.get_job(job_id) if job_id else None
+    job = _cached_job(job_id) if job_id else None
     mode = "job_specific" if job else "general"
 
     # Only return cached skill analysis from fit scoring
@@ -996,7 +1793,7 @@ def analyze_candidate_skills(company_id: str, user_id: str, job_id: str | None =
     cached_summary = candidate.get("skill_analysis_summary")
     if cached_analysis and cached_summary:
         try:
-            skills = json.loads(cached_analysis) if isinstance(cached_analysis, str) else cached_analysis
+            skills = orjson.loads(cached_analysis) if isinstance(cached_analysis, str) else cached_analysis
             if isinstance(skills, list) and len(skills) > 0:
                 return {
                     "mode": mode,
@@ -1015,7 +1812,7 @@ def analyze_candidate_skills(company_id: str, user_id: str, job_id: str | None =
 
 
 def submit_interviewee_list(job_id: str, user_ids: List[str]) -> None:
-    job = database.get_job(job_id)
+    job = _cached_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -1030,13 +1827,13 @@ def submit_interviewee_list(job_id: str, user_ids: List[str]) -> None:
 
 
 def submit_interviewee_feedback(job_id: str, user_id: str, feedback: str) -> Dict:
-    job = database.get_job(job_id)
+    job = _cached_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    feedback_id = str(datetime.now(timezone.utc).timestamp()).replace(".", "")
+    feedback_id = str(uuid4())
     entry = {"feedback_id": feedback_id, "job_id": job_id, "user_id": user_id, "feedback": feedback}
-    _interview_feedback.append(entry)
+    _feedback_by_job.setdefault(job_id, []).append(entry)
 
     company_id = job.get("company_id", "")
     if company_id:
@@ -1049,9 +1846,13 @@ def submit_interviewee_feedback(job_id: str, user_id: str, feedback: str) -> Dic
 
 
 def get_company_profile(company_id: str) -> Dict:
-    company = database.get_company_by_id(company_id)
+    company = _cached_company(company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
+    return _company_profile_payload(company)
+
+
+def _company_profile_payload(company: Dict[str, Any]) -> Dict:
     return {
         "company_id": company["id"],
         "email": company.get("email") or "",
@@ -1080,51 +1881,38 @@ def update_company_profile(profile_data: Dict) -> Dict:
     )
     if not updated:
         raise HTTPException(status_code=404, detail="Company not found")
+    _invalidate_cached("company", company_id)
 
     _add_activity(company_id, "Company profile updated", "Company details were updated.")
-    return get_company_profile(company_id)
+    return _company_profile_payload(updated)
 
 
 def list_company_jobs(company_id: str) -> List[Dict]:
-    if not database.get_company_by_id(company_id):
+    if not _cached_company(company_id):
         raise HTTPException(status_code=404, detail="Company not found")
 
     jobs = database.get_jobs_by_company(company_id)
     for job in jobs:
-        try:
-            job["skills"] = json.loads(job.get("skills", "[]"))
-        except Exception:
-            job["skills"] = []
+        job["skills"] = list(_parse_interests(job.get("skills") or "[]"))
     return jobs
 
 
 def list_company_applicants(company_id: str, job_id: str | None = None) -> List[Dict]:
-    if not database.get_company_by_id(company_id):
+    if not _cached_company(company_id):
         raise HTTPException(status_code=404, detail="Company not found")
-    applicants = database.get_company_applications(company_id, job_id=job_id)
+    return _attach_skills(database.get_company_applications(company_id, job_id=job_id))
+
+
+def _attach_skills(applicants: List[Dict]) -> List[Dict]:
+    """Set each applicant's "skills" from its interests JSON, in place."""
     for applicant in applicants:
         interests_raw = applicant.get("interests") or "[]"
-        try:
-            applicant["skills"] = json.loads(interests_raw) if isinstance(interests_raw, str) else []
-            if not isinstance(applicant["skills"], list):
-                applicant["skills"] = []
-        except Exception:
-            applicant["skills"] = []
+        applicant["skills"] = list(_parse_interests(interests_raw)) if isinstance(interests_raw, str) else []
     return applicants
 
 
-def _score_single_batch(
-    company_id: str,
-    job_id_key: str,
-    job_apps: List[Dict],
-) -> int:
-    """Score a single batch of applicants for one job. Returns count scored."""
-    import traceback as _tb
-    print(f"🔵 _score_single_batch called: job={job_id_key}, apps={len(job_apps)}", flush=True)
-    job = database.get_job(job_id_key)
-    if not job:
-        return 0
-
+def _candidate_pool(job_apps: List[Dict]) -> tuple[List[Dict], Dict[str, Dict]]:
+    """Candidate payloads for the rankers, plus the application behind each user_id."""
     candidate_pool = []
     app_by_user: Dict[str, Dict] = {}
     for app in job_apps:
@@ -1143,8 +1931,21 @@ def _score_single_batch(
                 "github_url": app.get("github_url", ""),
             }
         )
+    return candidate_pool, app_by_user
+
+
+_FIT_SCORING_PROMPT = "Evaluate each candidate's fit for this role based solely on the job requirements. Score them independently — do not compare them to each other."
+
+
+def _prepare_scoring_batch(job: Dict | None, job_apps: List[Dict]) -> Dict[str, Any] | None:
+    """Build the candidate pool and two-tower vectors for one batch. Returns None if there is nothing to score."""
+    print(f"🔵 _prepare_scoring_batch called: job={job and job['id']}, apps={len(job_apps)}", flush=True)
+    if not job:
+        return None
+
+    candidate_pool, app_by_user = _candidate_pool(job_apps)
     if not candidate_pool:
-        return 0
+        return None
 
     try:
         job_vec, user_vecs = _get_or_initialize_vectors_for_job(job, app_by_user)
@@ -1152,17 +1953,29 @@ def _score_single_batch(
         print(f"⚠️  Two-tower vectors failed (non-fatal): {e}", flush=True)
         job_vec, user_vecs = None, {}
 
-    prompt = "Evaluate each candidate's fit for this role based solely on the job requirements. Score them independently — do not compare them to each other."
-    try:
-        ranked = _openai_rank_and_analyze_candidates(job, prompt, candidate_pool)
-    except Exception as e:
-        import traceback
-        print(f"⚠️  OpenAI rank+analyze failed for job {job_id_key}: {e}")
-        traceback.print_exc()
-        ranked = _rank_candidates(prompt, candidate_pool)
+    return {
+        "job": job,
+        "candidate_pool": candidate_pool,
+        "app_by_user": app_by_user,
+        "job_vec": job_vec,
+        "user_vecs": user_vecs,
+    }
 
-    now_iso = _utc_now_iso()
-    scored_count = 0
+
+def _finish_scoring_batch(job_id_key: str, batch: Dict[str, Any], ranked: List[Dict]) -> int:
+    """Blend `ranked` GPT scores with two-tower scores and store them. Returns count scored."""
+    app_by_user = batch["app_by_user"]
+    job_vec, user_vecs = batch["job_vec"], batch["user_vecs"]
+
+    two_tower_by_user: Dict[str, float] = {}
+    if job_vec is not None and user_vecs:
+        # int8 path first; float32 covers anyone without a quantized vector yet.
+        two_tower_by_user = _two_tower_scores_i8(job_id_key, list(user_vecs))
+        remaining = {uid: vec for uid, vec in user_vecs.items() if uid not in two_tower_by_user}
+        if remaining:
+            two_tower_by_user.update(_two_tower_scores_by_user(remaining, job_vec))
+
+    rows = []
     for item in ranked:
         user_id = str(item.get("user_id") or "")
         app = app_by_user.get(user_id)
@@ -1172,25 +1985,30 @@ def _score_single_batch(
             gpt_score = int(item.get("score", 0))
         except Exception:
             gpt_score = 0
-        gpt_score = max(0, min(100, gpt_score))
-        gpt_score_01 = gpt_score / 100.0
+        rows.append((item, user_id, app, max(0, min(100, gpt_score))))
+    if not rows:
+        return 0
 
-        two_tower_score_01: float | None = None
-        if job_vec is not None:
-            user_vec = user_vecs.get(user_id)
-            if user_vec is not None:
-                two_tower_score_01 = _two_tower_score(user_vec, job_vec)
+    # Blend the whole batch at once; NaN marks users without a two-tower score (GPT score used alone).
+    gpt_01 = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows)) / 100.0
+    tt_01 = np.fromiter(
+        (two_tower_by_user.get(row[1], np.nan) for row in rows), dtype=np.float64, count=len(rows)
+    )
+    has_tt = ~np.isnan(tt_01)
+    final_01 = np.where(has_tt, (gpt_01 + np.nan_to_num(tt_01)) / 2.0, gpt_01)
+    final_scores = np.rint(np.clip(final_01, 0.0, 1.0) * 100).astype(int)
 
-        if two_tower_score_01 is None:
-            final_score_01 = gpt_score_01
-            blend_summary = f"Agent score {gpt_score} used (two-tower unavailable)."
-        else:
-            final_score_01 = (gpt_score_01 + two_tower_score_01) / 2.0
+    now_iso = _utc_now_iso()
+    updates = []
+    for i, (item, user_id, app, gpt_score) in enumerate(rows):
+        if has_tt[i]:
             blend_summary = (
-                f"Blended score = average(GPT {gpt_score_01:.2f}, two-tower {two_tower_score_01:.2f}) "
-                f"=> {final_score_01:.2f}."
+                f"Blended score = average(GPT {gpt_01[i]:.2f}, two-tower {tt_01[i]:.2f}) "
+                f"=> {final_01[i]:.2f}."
             )
-        final_score = int(round(max(0.0, min(1.0, final_score_01)) * 100))
+        else:
+            blend_summary = f"Agent score {gpt_score} used (two-tower unavailable)."
+        final_score = int(final_scores[i])
         base_reasoning = str(item.get("reasoning", "")).strip()
         fit_reasoning = f"{blend_summary} {base_reasoning}".strip()
         
@@ -1199,63 +2017,189 @@ def _score_single_batch(
         skill_summary = ""
         if "skill_analysis" in item and item["skill_analysis"]:
             try:
-                skill_analysis_json = json.dumps(item["skill_analysis"])
+                skill_analysis_json = orjson.dumps(item["skill_analysis"]).decode("utf-8")
                 skill_summary = item.get("skill_summary", "")
             except Exception:
                 pass
         
-        database.update_application_fit_score(
-            application_id=app["application_id"],
+        updates.append(
+            (final_score, fit_reasoning, now_iso, skill_analysis_json, skill_summary, app["application_id"])
+        )
+        # Keep the caller's applicant dict in sync with the row being written.
+        app.update(
             fit_score=final_score,
             fit_reasoning=fit_reasoning,
             fit_scored_at=now_iso,
             skill_analysis=skill_analysis_json,
             skill_analysis_summary=skill_summary,
         )
-        scored_count += 1
-    
+
+    database.update_application_fit_scores_bulk(updates)
+    return len(updates)
+
+
+async def _score_prepared_batch_async(client, job_id_key: str, batch: Dict[str, Any]) -> int:
+    """Rank one prepared batch with OpenAI (local ranking on failure), then store it off the event loop."""
+    try:
+        ranked = await _openai_rank_and_analyze_candidates_async(
+            client, batch["job"], _FIT_SCORING_PROMPT, batch["candidate_pool"]
+        )
+    except Exception as e:
+        import traceback
+        print(f"⚠️  OpenAI rank+analyze failed for job {job_id_key}: {e}")
+        traceback.print_exc()
+        ranked = _rank_candidates(_FIT_SCORING_PROMPT, batch["candidate_pool"])
+    return await asyncio.to_thread(_finish_scoring_batch, job_id_key, batch, ranked)
+
+
+def _submit_fit_scoring_batch(company_id: str, unrated: List[Dict]) -> str:
+    """Queue one fit-scoring request per applicant on the OpenAI Batch API. Returns the batch id.
+    The submitted application ids are stored with the batch and excluded from scoring until it finishes."""
+    api_key = _openai_api_key()
+    by_job: Dict[str, List[Dict]] = {}
+    for app in unrated:
+        by_job.setdefault(str(app["job_id"]), []).append(app)
+
+    lines = []
+    application_ids: List[str] = []
+    jobs = _cached_jobs(list(by_job))
+    for job_id_key, job_apps in by_job.items():
+        job = jobs[job_id_key]
+        if not job:
+            continue
+        candidate_pool, app_by_user = _candidate_pool(job_apps)
+        for candidate in candidate_pool:
+            system_msg, user_msg, _ = _rank_and_analyze_messages(job, _FIT_SCORING_PROMPT, [candidate])
+            application_ids.append(app_by_user[candidate["user_id"]]["application_id"])
+            lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": application_ids[-1],
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": _openai_chat_request(system_msg, user_msg),
+                    }
+                )
+            )
+    if not lines:
+        raise HTTPException(status_code=404, detail="No applicants to score")
+
+    try:
+        file_id = _openai_upload_batch_file(api_key, b"\n".join(lines) + b"\n")
+        raw = _openai_request(
+            api_key,
+            "POST",
+            "/v1/batches",
+            orjson.dumps({"input_file_id": file_id, "endpoint": "/v1/chat/completions", "completion_window": "24h"}),
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to submit scoring batch: {e}")
+    batch_id = orjson.loads(raw)["id"]
+    database.create_openai_batch(batch_id, company_id, application_ids)
+    print(f"🟡 score_unrated: submitted batch {batch_id} with {len(lines)} applicants", flush=True)
+    return batch_id
+
+
+def _store_batch_results(company_id: str, output: bytes) -> int:
+    """Blend and store the fit scores in a Batch API output file. Returns count scored."""
+    contents: Dict[str, str] = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        body = (record.get("response") or {}).get("body") or {}
+        content = body.get("choices", [{}])[0].get("message", {}).get("content", "")
+        if record.get("custom_id") and content:
+            contents[record["custom_id"]] = content
+
+    # Applicants scored some other way since submission keep their existing score.
+    by_job: Dict[str, List[Dict]] = {}
+    for app in database.get_company_applications(company_id):
+        if app["application_id"] in contents and app.get("fit_score") is None:
+            by_job.setdefault(str(app["job_id"]), []).append(app)
+
+    scored_count = 0
+    jobs = _cached_jobs(list(by_job))
+    for job_id_key, job_apps in by_job.items():
+        batch = _prepare_scoring_batch(jobs[job_id_key], _attach_skills(job_apps))
+        if batch is None:
+            continue
+        ranked: List[Dict] = []
+        for candidate in batch["candidate_pool"]:
+            content = contents[batch["app_by_user"][candidate["user_id"]]["application_id"]]
+            try:
+                ranked.extend(
+                    _openai_merge_ranked(content, [candidate], "score", "reasoning", "Model-ranked candidate.", True)
+                )
+            except Exception as e:
+                print(f"⚠️  Batch result unusable for {candidate['user_id']}: {e}")
+                ranked.extend(_rank_candidates(_FIT_SCORING_PROMPT, [candidate]))
+        scored_count += _finish_scoring_batch(job_id_key, batch, ranked)
     return scored_count
 
 
-def score_unrated_applicants(
-    company_id: str, 
-    job_id: str | None = None,
-    batch_size: int = 5,
-    offset: int = 0,
-) -> Dict:
-    """Score unrated applicants in parallel. Up to 20 threads, each processing batch_size applicants."""
-    if not database.get_company_by_id(company_id):
-        raise HTTPException(status_code=404, detail="Company not found")
-    
-    # Get all applicants for counting
-    all_applicants = database.get_company_applications(company_id, job_id=job_id)
-    for applicant in all_applicants:
-        interests_raw = applicant.get("interests") or "[]"
+def poll_openai_batches() -> int:
+    """Collect finished fit-scoring batches and store their scores. Returns count scored.
+
+    Meant to run periodically (see poll_openai_batches.py); batches still in progress are left for the next run.
+    """
+    pending = database.get_pending_openai_batches()
+    if not pending:
+        return 0
+    api_key = _openai_api_key()
+
+    total_scored = 0
+    for row in pending:
+        batch_id = row["id"]
         try:
-            applicant["skills"] = json.loads(interests_raw) if isinstance(interests_raw, str) else []
-            if not isinstance(applicant["skills"], list):
-                applicant["skills"] = []
-        except Exception:
-            applicant["skills"] = []
-    
-    # Count total unrated before processing
-    unrated = [a for a in all_applicants if a.get("fit_score") is None]
-    total_unrated_before = len(unrated)
-    
-    if total_unrated_before == 0:
-        return {"scored_count": 0, "total_unrated": 0, "applicants": all_applicants}
-    
-    # Take up to 20 batches (20 threads * batch_size applicants each)
-    MAX_PARALLEL_BATCHES = 20
-    total_to_process = min(total_unrated_before, MAX_PARALLEL_BATCHES * batch_size)
-    batches_to_process = unrated[:total_to_process]
-    
-    if not batches_to_process:
-        return {"scored_count": 0, "total_unrated": total_unrated_before, "applicants": all_applicants}
-    
+            batch = orjson.loads(_openai_request(api_key, "GET", f"/v1/batches/{batch_id}"))
+            status = batch.get("status")
+            if status in ("failed", "expired", "cancelled"):
+                print(f"⚠️  Scoring batch {batch_id} ended with status {status}")
+                database.update_openai_batch_status(batch_id, status)
+                continue
+            if status != "completed":
+                continue
+            scored = 0
+            if batch.get("output_file_id"):
+                output = _openai_request(api_key, "GET", f"/v1/files/{batch['output_file_id']}/content")
+                scored = _store_batch_results(row["company_id"], output)
+        except Exception as e:
+            import traceback
+            print(f"⚠️  Polling scoring batch {batch_id} failed: {e}")
+            traceback.print_exc()
+            continue
+        database.update_openai_batch_status(batch_id, "completed")
+        if scored:
+            _add_activity(row["company_id"], "Applicant fit scores updated", f"Scored {scored} applicants.")
+        total_scored += scored
+    return total_scored
+
+
+def _claim_for_scoring(apps: List[Dict], limit: int) -> List[Dict]:
+    """Mark up to `limit` of `apps` as being scored by this request; ones already in flight are skipped."""
+    claimed = []
+    with _scoring_inflight_lock:
+        for app in apps:
+            if len(claimed) >= limit:
+                break
+            key = (str(app["job_id"]), str(app["user_id"]))
+            if key not in _scoring_inflight:
+                _scoring_inflight.add(key)
+                claimed.append(app)
+    return claimed
+
+
+def _release_scoring_claims(apps: List[Dict]) -> None:
+    with _scoring_inflight_lock:
+        _scoring_inflight.difference_update((str(app["job_id"]), str(app["user_id"])) for app in apps)
+
+
+def _score_applicants(apps: List[Dict], batch_size: int) -> tuple[int, List[str]]:
+    """Score `apps` in batches of batch_size. Returns (count scored, per-batch error messages)."""
     # Group by job, then split into batches of batch_size
     by_job: Dict[str, List[Dict]] = {}
-    for app in batches_to_process:
+    for app in apps:
         by_job.setdefault(str(app["job_id"]), []).append(app)
     
     # Create work items: (job_id, batch_of_apps)
@@ -1266,52 +2210,145 @@ def score_unrated_applicants(
             chunk = job_apps[i:i + batch_size]
             work_items.append((job_id_key, chunk))
 
-    print(f"🟡 score_unrated: {len(unrated)} unrated, {len(by_job)} jobs, {len(work_items)} work items", flush=True)
+    print(f"🟡 score_unrated: {len(apps)} claimed, {len(by_job)} jobs, {len(work_items)} work items", flush=True)
     
-    # Process in parallel with up to 20 threads
     total_scored = 0
     scoring_errors: List[str] = []
+
+    def record_error(job_id_key: str, count: int, e: BaseException) -> None:
+        import traceback
+        err_msg = f"Batch scoring failed for job {job_id_key} ({count} applicants): {e}"
+        print(f"⚠️  {err_msg}")
+        traceback.print_exception(e)
+        scoring_errors.append(err_msg)
+
+    # One query for every distinct job rather than a get_job per batch.
+    jobs = _cached_jobs(list(by_job))
+
+    # Vector loading/initialization is blocking SQLite work, so it stays on threads.
+    prepared: List[tuple[str, int, Dict[str, Any]]] = []
     with ThreadPoolExecutor(max_workers=min(20, len(work_items))) as executor:
         future_to_work = {
-            executor.submit(_score_single_batch, company_id, job_id_key, job_apps): (job_id_key, len(job_apps))
+            executor.submit(_prepare_scoring_batch, jobs[job_id_key], job_apps): (job_id_key, len(job_apps))
             for job_id_key, job_apps in work_items
         }
-
         for future in as_completed(future_to_work):
+            job_id_key, count = future_to_work[future]
             try:
-                scored = future.result()
-                total_scored += scored
+                batch = future.result()
             except Exception as e:
-                import traceback
-                job_id_key, count = future_to_work[future]
-                err_msg = f"Batch scoring failed for job {job_id_key} ({count} applicants): {e}"
-                print(f"⚠️  {err_msg}")
-                traceback.print_exc()
-                scoring_errors.append(err_msg)
+                record_error(job_id_key, count, e)
+                continue
+            if batch is not None:
+                prepared.append((job_id_key, count, batch))
+
+    # All OpenAI calls share one event loop and connection pool. Each batch is blended and stored
+    # as soon as its own response arrives, overlapping DB writes with the calls still in flight.
+    results = _run_openai_fanout([
+        functools.partial(_score_prepared_batch_async, job_id_key=job_id_key, batch=batch)
+        for job_id_key, _, batch in prepared
+    ])
+
+    for (job_id_key, count, _), scored in zip(prepared, results):
+        if isinstance(scored, BaseException):
+            record_error(job_id_key, count, scored)
+        else:
+            total_scored += scored
+
+    return total_scored, scoring_errors
+
+
+def score_unrated_applicants(
+    company_id: str, 
+    job_id: str | None = None,
+    batch_size: int = 5,
+    offset: int = 0,
+    mode: str = "sync",
+) -> Dict:
+    """Score unrated applicants in parallel. Up to 20 threads, each processing batch_size applicants.
+
+    mode="batch" instead queues every unrated applicant on the OpenAI Batch API (half the token
+    cost, results within 24h) and returns immediately with the batch_id; poll_openai_batches
+    stores the scores once the batch completes.
+    """
+    if not _cached_company(company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+    if mode not in ("sync", "batch"):
+        raise HTTPException(status_code=400, detail="mode must be 'sync' or 'batch'")
     
-    # Get refreshed applicant list with new scores
-    applicants = database.get_company_applications(company_id, job_id=job_id)
-    for applicant in applicants:
-        interests_raw = applicant.get("interests") or "[]"
+    # Fetched once: _finish_scoring_batch updates these dicts in place, so no refetch is needed afterwards.
+    all_applicants = _attach_skills(database.get_company_applications(company_id, job_id=job_id))
+    
+    # Count total unrated before processing
+    unrated = [a for a in all_applicants if a.get("fit_score") is None]
+    total_unrated_before = len(unrated)
+    
+    if total_unrated_before == 0:
+        return {"scored_count": 0, "total_unrated": 0, "applicants": all_applicants}
+
+    # Applicants already queued in a pending Batch API job are paid for; neither mode re-scores them.
+    pending = database.get_pending_batch_application_ids(company_id)
+    if pending:
+        unrated = [a for a in unrated if a["application_id"] not in pending]
+
+    if mode == "batch":
+        # Claimed like sync scoring until the batch is recorded, so concurrent requests can't submit them too.
+        claimed = _claim_for_scoring(unrated, len(unrated))
+        if not claimed:
+            return {"scored_count": 0, "total_unrated": total_unrated_before, "applicants": all_applicants}
         try:
-            applicant["skills"] = json.loads(interests_raw) if isinstance(interests_raw, str) else []
-            if not isinstance(applicant["skills"], list):
-                applicant["skills"] = []
-        except Exception:
-            applicant["skills"] = []
+            batch_id = _submit_fit_scoring_batch(company_id, claimed)
+        finally:
+            _release_scoring_claims(claimed)
+        return {
+            "scored_count": 0,
+            "total_unrated": total_unrated_before,
+            "applicants": all_applicants,
+            "batch_id": batch_id,
+        }
+    
+    # Take up to 20 batches (20 threads * batch_size applicants each), skipping applicants another
+    # request is already scoring so concurrent "Score now" clicks don't pay for the same rows twice.
+    MAX_PARALLEL_BATCHES = 20
+    batches_to_process = _claim_for_scoring(unrated, MAX_PARALLEL_BATCHES * batch_size)
+    
+    if not batches_to_process:
+        return {"scored_count": 0, "total_unrated": total_unrated_before, "applicants": all_applicants}
     
-    # Count remaining unrated
-    remaining_unrated = len([a for a in applicants if a.get("fit_score") is None])
+    try:
+        total_scored, scoring_errors = _score_applicants(batches_to_process, batch_size)
+    finally:
+        _release_scoring_claims(batches_to_process)
+    
+    remaining_unrated = total_unrated_before - total_scored
     
     if total_scored:
         _add_activity(company_id, "Applicant fit scores updated", f"Scored {total_scored} applicants.")
     
-    result = {"scored_count": total_scored, "total_unrated": remaining_unrated, "applicants": applicants}
+    result = {"scored_count": total_scored, "total_unrated": remaining_unrated, "applicants": all_applicants}
     if scoring_errors:
         result["scoring_errors"] = scoring_errors
     return result
 
 
+# Model output kept per candidate in gpt_score_cache; identity fields come from the live application.
+_REPORT_SCORE_CACHE_FIELDS = ("custom_fit_score", "custom_fit_reasoning", "skill_analysis", "skill_summary")
+
+
+def _report_score_cache_key(job: Dict, custom_prompt: str, candidate: Dict) -> str:
+    """Content hash of everything the hybrid ranker sees for one candidate."""
+    return hashlib.blake2b(
+        orjson.dumps(
+            [
+                _openai_job_summary(job),
+                custom_prompt,
+                _openai_candidate_payload([candidate])[0],
+            ]
+        ),
+        digest_size=16,
+    ).hexdigest()
+
+
 def generate_custom_report(
     company_id: str,
     job_id: str,
@@ -1322,23 +2359,15 @@ def generate_custom_report(
     Generate a custom report with hybrid scoring (50% job fit + 50% custom criteria).
     Returns report_id and top candidates with custom fit scores.
     """
-    if not database.get_company_by_id(company_id):
+    if not _cached_company(company_id):
         raise HTTPException(status_code=404, detail="Company not found")
     
-    job = database.get_job(job_id)
+    job = _cached_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get all applicants for this job
-    all_applicants = database.get_company_applications(company_id, job_id=job_id)
-    for applicant in all_applicants:
-        interests_raw = applicant.get("interests") or "[]"
-        try:
-            applicant["skills"] = json.loads(interests_raw) if isinstance(interests_raw, str) else []
-            if not isinstance(applicant["skills"], list):
-                applicant["skills"] = []
-        except Exception:
-            applicant["skills"] = []
+    all_applicants = _attach_skills(database.get_company_applications(company_id, job_id=job_id))
     
     if not all_applicants:
         raise HTTPException(status_code=404, detail="No applicants found for this job")
@@ -1377,34 +2406,58 @@ def generate_custom_report(
     # Score candidates with hybrid weighting using parallel processing
     BATCH_SIZE = 5
     MAX_PARALLEL_BATCHES = 20
-    total_candidates = len(candidate_pool)
-    
-    # Split into batches
-    batches = []
-    for i in range(0, min(total_candidates, MAX_PARALLEL_BATCHES * BATCH_SIZE), BATCH_SIZE):
-        batch = candidate_pool[i:i + BATCH_SIZE]
-        batches.append(batch)
-    
-    if not batches:
+    to_rank = candidate_pool[:MAX_PARALLEL_BATCHES * BATCH_SIZE]
+    if not to_rank:
         raise HTTPException(status_code=404, detail="No candidates to score")
-    
-    # Process batches in parallel
-    all_ranked = []
+
+    # Candidates whose job, profile and criteria were scored before reuse that result.
+    cache_keys = {c["user_id"]: _report_score_cache_key(job, custom_prompt, c) for c in to_rank}
+    cached = database.get_gpt_score_cache(list(cache_keys.values()))
+    all_ranked = [
+        {
+            "user_id": c["user_id"],
+            "name": c.get("name") or "",
+            "skills": c.get("skills", []),
+            **orjson.loads(cached[cache_keys[c["user_id"]]]),
+        }
+        for c in to_rank
+        if cache_keys[c["user_id"]] in cached
+    ]
+    to_score = [c for c in to_rank if cache_keys[c["user_id"]] not in cached]
+    print(f"🟡 custom report: {len(all_ranked)} cached, {len(to_score)} to score", flush=True)
+
+    # Split into batches
+    batches = [to_score[i:i + BATCH_SIZE] for i in range(0, len(to_score), BATCH_SIZE)]
+
+    # Process batches concurrently on one event loop
     try:
-        with ThreadPoolExecutor(max_workers=min(len(batches), 20)) as executor:
-            job_prompt = "Evaluate each candidate's fit for this role based solely on the job requirements."
-            futures = {
-                executor.submit(_openai_hybrid_rank_candidates, job, job_prompt, custom_prompt, batch): batch
-                for batch in batches
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    ranked_batch = future.result()
-                    all_ranked.extend(ranked_batch)
-                except Exception as e:
-                    print(f"⚠️  Batch scoring failed: {e}")
-                    # Continue with other batches
+        job_prompt = "Evaluate each candidate's fit for this role based solely on the job requirements."
+        results = _run_openai_fanout([
+            functools.partial(
+                _openai_hybrid_rank_candidates_async,
+                job=job,
+                job_prompt=job_prompt,
+                custom_prompt=custom_prompt,
+                candidates=batch,
+            )
+            for batch in batches
+        ])
+
+        newly_scored = []
+        for ranked_batch in results:
+            if isinstance(ranked_batch, BaseException):
+                print(f"⚠️  Batch scoring failed: {ranked_batch}")
+                # Continue with other batches
+                continue
+            newly_scored.extend(ranked_batch)
+        all_ranked.extend(newly_scored)
+        database.put_gpt_score_cache([
+            (
+                cache_keys[item["user_id"]],
+                orjson.dumps({k: item[k] for k in _REPORT_SCORE_CACHE_FIELDS if k in item}).decode("utf-8"),
+            )
+            for item in newly_scored
+        ])
         
         if not all_ranked:
             raise HTTPException(status_code=500, detail="Failed to score any candidates")
@@ -1418,6 +2471,8 @@ def generate_custom_report(
     
     # Save report scores and update application skill analysis
     now_iso = _utc_now_iso()
+    report_rows = []
+    fit_updates = []
     for item in all_ranked:
         user_id = str(item.get("user_id") or "")
         app = app_by_user.get(user_id)
@@ -1425,11 +2480,8 @@ def generate_custom_report(
             continue
         
         # Save report score
-        database.save_report_score(
-            report_id=report_id,
-            application_id=app["application_id"],
-            custom_fit_score=item.get("custom_fit_score", 0),
-            custom_fit_reasoning=item.get("custom_fit_reasoning", ""),
+        report_rows.append(
+            (app["application_id"], item.get("custom_fit_score", 0), item.get("custom_fit_reasoning", ""))
         )
         
         # Also update the application with skill analysis if available
@@ -1437,21 +2489,26 @@ def generate_custom_report(
         skill_summary = ""
         if "skill_analysis" in item and item["skill_analysis"]:
             try:
-                skill_analysis_json = json.dumps(item["skill_analysis"])
+                skill_analysis_json = orjson.dumps(item["skill_analysis"]).decode("utf-8")
                 skill_summary = item.get("skill_summary", "")
             except Exception:
                 pass
         
         # Update application with skill analysis (if not already present)
         if skill_analysis_json and not app.get("skill_analysis"):
-            database.update_application_fit_score(
-                application_id=app["application_id"],
-                fit_score=app.get("fit_score") or 0,
-                fit_reasoning=app.get("fit_reasoning", ""),
-                fit_scored_at=app.get("fit_scored_at") or now_iso,
-                skill_analysis=skill_analysis_json,
-                skill_analysis_summary=skill_summary,
+            fit_updates.append(
+                (
+                    app.get("fit_score") or 0,
+                    app.get("fit_reasoning", ""),
+                    app.get("fit_scored_at") or now_iso,
+                    skill_analysis_json,
+                    skill_summary,
+                    app["application_id"],
+                )
             )
+
+    database.save_report_scores_bulk(report_id, report_rows)
+    database.update_application_fit_scores_bulk(fit_updates)
     
     # Return report summary with top candidates
     top_candidates = []
@@ -1527,22 +2584,25 @@ def update_application_status(
 
 
 def get_company_dashboard(company_id: str) -> Dict:
-    if not database.get_company_by_id(company_id):
+    # One query for the existence check and every count; no job or application rows are fetched.
+    counts = database.get_company_dashboard_stats(company_id)
+    if counts is None:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    jobs = list_company_jobs(company_id)
-    applications = database.get_company_applications(company_id)
-    counts = database.get_company_application_stats(company_id)
-    total_applicants = len(applications)
+    active_postings = counts.pop("job_count")
+    total_applicants = counts.pop("total")
     interview_rate = round((counts["in_progress"] / total_applicants) * 100, 1) if total_applicants else 0.0
 
-    activities = list(reversed(_activities_by_company.get(company_id, [])))[:10]
+    activities = [
+        {"action": entry["action"], "detail": entry["detail"], "time": _ns_to_iso(entry["ts_ns"])}
+        for entry in islice(reversed(_company_activities(company_id)), 10)
+    ]
     return {
         "company_id": company_id,
         "stats": {
-            "active_postings": len(jobs),
+            "active_postings": active_postings,
             "total_applicants": total_applicants,
-            "ai_agent_queries": _agent_queries_by_company.get(company_id, 0),
+            "ai_agent_queries": _agent_queries_by_company[company_id],
             "interview_rate_percent": interview_rate,
         },
         "workflow": counts,
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import importlib.util
 import json
 import random
@@ -107,6 +108,18 @@ def _job_payload_for_initializer(job: Dict) -> Dict:
     }
 
 
+def extract_resume_text(pdf_bytes: bytes) -> str:
+    """Extract resume text, reusing the stored result when the same PDF was parsed before."""
+    content_hash = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+    cached = database.get_cached_resume_text(content_hash)
+    if cached is not None:
+        return cached
+    text = pdf_utils.extract_pdf_text(pdf_bytes)
+    if text:
+        database.put_cached_resume_text(content_hash, text)
+    return text
+
+
 def _today_utc_key() -> str:
     return datetime.now(timezone.utc).date().isoformat()
 
@@ -166,7 +179,7 @@ def create_user(user_data: Dict) -> Dict:
         if not pdf_bytes:
             raise HTTPException(status_code=400, detail="Empty resume PDF")
         resume_pdf = pdf_bytes
-        resume_text = pdf_utils.extract_pdf_text(pdf_bytes)
+        resume_text = extract_resume_text(pdf_bytes)
     elif resume:
         resume_text = resume
 
@@ -355,7 +368,7 @@ def update_user_profile(user_id: str, profile_data: Dict) -> Dict:
             raise HTTPException(status_code=400, detail="Invalid resume PDF")
         if pdf_bytes:
             resume_pdf = pdf_bytes
-            resume_text = pdf_utils.extract_pdf_text(pdf_bytes)
+            resume_text = extract_resume_text(pdf_bytes)
 
     interests_str = json.dumps(interests) if interests is not None else None
 
@@ -15,6 +15,7 @@ import os
 import random
 import re
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -34,6 +35,24 @@ def _normalize(v: np.ndarray) -> np.ndarray:
     return (v / norm).astype(np.float32)
 
 
+def _ensure_vector_blob_columns(conn: sqlite3.Connection, table: str) -> None:
+    # Raw float32 and int8-quantized copies of vector_json so readers can skip JSON parsing;
+    # NULL on rows written before they existed.
+    for column in ("vector_blob BLOB", "vector_i8 BLOB", "vector_scale REAL"):
+        try:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass
+
+
+def _quantize_i8(vec: np.ndarray) -> Tuple[bytes | None, float]:
+    # Per-vector max-abs scaling; cosine scoring ignores the scale, it's kept for dequantizing.
+    scale = float(np.max(np.abs(vec))) if vec.size else 0.0
+    if scale <= 1e-12:
+        return None, 0.0
+    return np.round(vec / scale * 127.0).astype(np.int8).tobytes(), scale
+
+
 def _extract_json_object(text: str) -> dict:
     text = (text or "").strip()
     try:
@@ -217,17 +236,29 @@ class NewEmbeddingInitializer:
         return _normalize(vec)
 
     def _upsert(self, table: str, entity_id: str, vec: np.ndarray, metadata: Dict[str, Any]) -> None:
+        self._upsert_many(table, [(entity_id, vec, metadata)])
+
+    def _upsert_many(self, table: str, items: List[Tuple[str, np.ndarray, Dict[str, Any]]]) -> None:
+        rows = []
+        for entity_id, vec, metadata in items:
+            vec = _normalize(vec)
+            vec_i8, scale = _quantize_i8(vec)
+            rows.append((entity_id, json.dumps(vec.tolist()), vec.tobytes(), vec_i8, scale, json.dumps(metadata)))
         with self._conn() as conn:
-            conn.execute(
+            _ensure_vector_blob_columns(conn, table)
+            conn.executemany(
                 f"""
-                INSERT INTO {table} (id, vector_json, metadata_json, updated_at)
-                VALUES (?, ?, ?, datetime('now'))
+                INSERT INTO {table} (id, vector_json, vector_blob, vector_i8, vector_scale, metadata_json, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
                 ON CONFLICT(id) DO UPDATE SET
                     vector_json = excluded.vector_json,
+                    vector_blob = excluded.vector_blob,
+                    vector_i8 = excluded.vector_i8,
+                    vector_scale = excluded.vector_scale,
                     metadata_json = excluded.metadata_json,
                     updated_at = datetime('now')
                 """,
-                (entity_id, json.dumps(_normalize(vec).tolist()), json.dumps(metadata)),
+                rows,
             )
 
     def initialize_new_job(
@@ -284,3 +315,56 @@ class NewEmbeddingInitializer:
             "farthest_ids": [sampled[i]["id"] for i in farthest_idx],
         }
 
+    def initialize_new_users_bulk(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]],
+        sample_size: int = 30,
+        pos_weight: float = 1.0,
+        neg_weight: float = 0.7,
+    ) -> List[Dict[str, Any]]:
+        """initialize_new_user for several (user_id, user_payload) pairs.
+
+        Loads the existing user vectors once, runs the LLM rankings concurrently, and writes every
+        new vector in one transaction. Users whose LLM ranking fails are skipped; returns results
+        for the ones written.
+        """
+        if not items:
+            return []
+        rows = self._load_table("user_vectors")
+        if len(rows) < 10:
+            raise RuntimeError(f"Need at least 10 existing users in vecdb; found {len(rows)}")
+        if len(rows) < sample_size:
+            sample_size = len(rows)
+
+        def rank(user_payload: Dict[str, Any]):
+            sampled = random.sample(rows, sample_size)
+            try:
+                return sampled, self._llm_rank_closest_farthest("user", user_payload, sampled)
+            except Exception:
+                return None
+
+        # The rankings are independent network calls, so threads overlap their latency.
+        with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+            ranked = list(executor.map(rank, [payload for _, payload in items]))
+
+        writes: List[Tuple[str, np.ndarray, Dict[str, Any]]] = []
+        results: List[Dict[str, Any]] = []
+        for (user_id, user_payload), outcome in zip(items, ranked):
+            if outcome is None:
+                continue
+            sampled, (closest_idx, farthest_idx) = outcome
+            vec = self._compose_vector(sampled, closest_idx, farthest_idx, pos_weight, neg_weight)
+            writes.append((user_id, vec, user_payload))
+            results.append(
+                {
+                    "entity_type": "user",
+                    "id": user_id,
+                    "sample_size": sample_size,
+                    "closest_ids": [sampled[i]["id"] for i in closest_idx],
+                    "farthest_ids": [sampled[i]["id"] for i in farthest_idx],
+                }
+            )
+
+        if writes:
+            self._upsert_many("user_vectors", writes)
+        return results
@@ -33,6 +33,24 @@ def _normalize(v: np.ndarray) -> np.ndarray:
     return (v / norm).astype(np.float32)
 
 
+def _ensure_vector_blob_columns(conn: sqlite3.Connection, table: str) -> None:
+    # Raw float32 and int8-quantized copies of vector_json so readers can skip JSON parsing;
+    # NULL on rows written before they existed.
+    for column in ("vector_blob BLOB", "vector_i8 BLOB", "vector_scale REAL"):
+        try:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass
+
+
+def _quantize_i8(vec: np.ndarray) -> Tuple[bytes | None, float]:
+    # Per-vector max-abs scaling; cosine scoring ignores the scale, it's kept for dequantizing.
+    scale = float(np.max(np.abs(vec))) if vec.size else 0.0
+    if scale <= 1e-12:
+        return None, 0.0
+    return np.round(vec / scale * 127.0).astype(np.int8).tobytes(), scale
+
+
 def _pull(a: np.ndarray, b: np.ndarray, strength: float) -> Tuple[np.ndarray, np.ndarray]:
     a0 = a.copy()
     b0 = b.copy()
@@ -84,13 +102,16 @@ class EmbeddingUpdater:
         return _normalize(vec)
 
     def _save_vector(self, conn: sqlite3.Connection, table: str, entity_id: str, vec: np.ndarray) -> None:
+        vec = _normalize(vec)
+        _ensure_vector_blob_columns(conn, table)
+        vec_i8, scale = _quantize_i8(vec)
         conn.execute(
             f"""
             UPDATE {table}
-            SET vector_json = ?, updated_at = datetime('now')
+            SET vector_json = ?, vector_blob = ?, vector_i8 = ?, vector_scale = ?, updated_at = datetime('now')
             WHERE id = ?
             """,
-            (json.dumps(_normalize(vec).tolist()), entity_id),
+            (json.dumps(vec.tolist()), vec.tobytes(), vec_i8, scale, entity_id),
         )
 
     def _get_metadata(self, conn: sqlite3.Connection, table: str, entity_id: str) -> Dict[str, Any]: